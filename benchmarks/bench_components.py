@@ -0,0 +1,564 @@
+# benchmarks/bench_components.py
+"""
+Offline micro-benchmarks for the game components.
+
+Usage:
+    python -m benchmarks.bench_components --output bench_results.json
+    python -m benchmarks.bench_components --baseline old.json --output new.json
+
+Each benchmark is skipped (and recorded as skipped) when its dependencies
+or model files are not available, so the suite always produces a report.
+Audio benchmarks are also skipped when sounddevice cannot find PortAudio
+(it raises OSError on import).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+DEFAULT_SIZES = [10, 100, 1000, 5000]
+
+CHARACTERS = ["Eva", "Battler", "Kinzo", "Rosa", "Natsuhi", "Kanon", "Shannon", "Genji"]
+LOCATIONS = ["study", "library", "bedroom", "kitchen", "garden", "guest room", "chapel"]
+OBJECTS = ["master key", "letter", "candlestick", "ledger", "rifle", "portrait"]
+
+
+def synthetic_truths(count, seed=0):
+    """Generate count red-truth style statements"""
+    rng = random.Random(seed)
+    truths = []
+    for i in range(count):
+        who = rng.choice(CHARACTERS)
+        where = rng.choice(LOCATIONS)
+        what = rng.choice(OBJECTS)
+        hour = rng.randint(7, 11)
+        minute = rng.choice(["00", "15", "30", "45"])
+        truths.append(f"{who} was in the {where} with the {what} at {hour}:{minute} PM (#{i})")
+    return truths
+
+
+def synthetic_statements(count, seed=1):
+    """Generate player statements to check against the truth store"""
+    return synthetic_truths(count, seed=seed)
+
+
+def time_calls(fn, args_list, repeat=5, warmup=True):
+    """Time fn over args_list and return latency stats in microseconds"""
+    # One untimed call so first-call effects don't skew the samples
+    if warmup:
+        for args in args_list[:1]:
+            fn(*args)
+    samples = []
+    for _ in range(repeat):
+        for args in args_list:
+            start = time.perf_counter()
+            fn(*args)
+            samples.append((time.perf_counter() - start) * 1e6)
+    return summarize(samples)
+
+
+def summarize(samples):
+    """Summarize a list of latency samples (microseconds)"""
+    ordered = sorted(samples)
+    return {
+        "calls": len(ordered),
+        "mean_us": statistics.fmean(ordered),
+        "p50_us": percentile(ordered, 50),
+        "p95_us": percentile(ordered, 95),
+        "max_us": ordered[-1],
+    }
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return None
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def skipped(reason):
+    return {"skipped": reason}
+
+
+def bench_contradiction_checker(sizes, statements=50):
+    """ContradictionChecker.check_statement against growing red-truth lists"""
+    try:
+        from src.game.truth_battle import TruthBattleSystem
+        from src.utils.contradiction_checker import ContradictionChecker
+    except ImportError as e:
+        return skipped(str(e))
+
+    probes = synthetic_statements(statements)
+    results = {}
+    for size in sizes:
+        # Declared the way GameMaster does, so the checker can use the truth index
+        battle = TruthBattleSystem()
+        for truth in synthetic_truths(size):
+            battle.declare_red_truth(truth)
+        checker = ContradictionChecker(truth_index=battle.truth_index)
+        facts = {"red_truths": [truth["statement"] for truth in battle.red_truths.values()]}
+        results[str(size)] = time_calls(checker.check_statement, [(p, facts) for p in probes])
+    return results
+
+
+def bench_truth_battle(sizes, statements=50):
+    """TruthBattleSystem.check_contradiction against growing truth stores"""
+    try:
+        from src.game.truth_battle import TruthBattleSystem
+    except ImportError as e:
+        return skipped(str(e))
+
+    probes = synthetic_statements(statements)
+    results = {}
+    for size in sizes:
+        battle = TruthBattleSystem()
+        declare = time_calls(battle.declare_red_truth, [(t,) for t in synthetic_truths(size)],
+                             repeat=1, warmup=False)
+        check = time_calls(battle.check_contradiction, [(p, None) for p in probes])
+        results[str(size)] = {
+            "declare_red_truth": declare,
+            "check_contradiction": check,
+            "truths_stored": len(battle.red_truths),
+        }
+    return results
+
+
+def bench_prompt_building(sizes, questions=50):
+    """GameMaster prompt builders with growing truth stores"""
+    # The Anthropic client refuses to construct without a key; no request is made.
+    os.environ.setdefault("ANTHROPIC_API_KEY", "offline-benchmark")
+    try:
+        from src.game.game_master import GameMaster
+    except ImportError as e:
+        return skipped(str(e))
+
+    probes = synthetic_statements(questions)
+    results = {}
+    for size in sizes:
+        game = GameMaster()
+        for truth in synthetic_truths(size):
+            game.truth_battle.declare_red_truth(truth)
+        question = time_calls(game._build_question_context, [(p,) for p in probes])
+        prompt_chars = len(game._build_question_context(probes[0]))
+        results[str(size)] = {
+            "build_question_context": question,
+            "prompt_chars": prompt_chars,
+        }
+    return results
+
+
+def bench_evidence_graph(sizes, queries=50):
+    """EvidenceSystem graph queries against a linear scan, with growing statement counts"""
+    try:
+        from src.game.evidence_system import EvidenceSystem
+    except ImportError as e:
+        return skipped(str(e))
+
+    rng = random.Random(3)
+    probes = synthetic_statements(queries)
+    pairs = [(rng.choice(CHARACTERS), rng.choice(LOCATIONS)) for _ in range(queries)]
+
+    def scan(statements, who, where):
+        # What answering "links between who and where after 9 PM" costs without the index
+        return [s for s in statements if who in s and where in s and int(s.split(" at ")[1].split(":")[0]) >= 9]
+
+    results = {}
+    for size in sizes:
+        evidence = EvidenceSystem()
+        statements = synthetic_truths(size)
+        add = time_calls(
+            lambda i, text: evidence.add_evidence("statement", {"who": CHARACTERS[i % len(CHARACTERS)], "says": text}),
+            list(enumerate(statements)), repeat=1, warmup=False
+        )
+        results[str(size)] = {
+            "add_statement": add,
+            "links_between": time_calls(
+                lambda who, where: evidence.links_between(who, where, after="9 PM"), pairs
+            ),
+            "linear_scan": time_calls(lambda who, where: scan(statements, who, where), pairs),
+            "relevant_facts": time_calls(lambda text: evidence.relevant_facts(text, limit=12), [(p,) for p in probes]),
+            "graph": evidence.graph.stats(),
+        }
+    return results
+
+
+async def _audio_queue_run(items, synth_seconds_per_char):
+    from benchmarks.fakes import FakeAudioManager
+
+    manager = FakeAudioManager(synth_seconds_per_char=synth_seconds_per_char)
+    texts = synthetic_statements(items)
+    start = time.perf_counter()
+    for text in texts:
+        await manager.queue_audio(text)
+    manager.audio_queue.close()
+    await manager.process_audio_queue()
+    elapsed = time.perf_counter() - start
+    return {
+        "items": items,
+        "played": manager.played,
+        "seconds": elapsed,
+        "items_per_second": manager.played / elapsed if elapsed else None,
+    }
+
+
+def bench_audio_queue(items=200, synth_seconds_per_char=0.0):
+    """Audio queue throughput with a fake synthesizer"""
+    try:
+        import benchmarks.fakes  # noqa: F401
+    except (ImportError, OSError) as e:
+        return skipped(str(e))
+    return asyncio.run(_audio_queue_run(items, synth_seconds_per_char))
+
+
+async def _barge_in_turns(manager, turns, during):
+    """
+    Each turn queues a multi-sentence narration plus a follow-up, then the
+    next turn barges in while the narration is still synthesizing or playing
+    """
+    for text in synthetic_statements(turns):
+        await manager.queue_audio(" ".join([text + "."] * 20))
+        await manager.queue_audio(text)
+        # Wait until the narration (not the follow-up) is the one being spoken
+        while manager.audio_queue.qsize() > 1 or not manager.audio_queue.stats()["speaking"]:
+            await asyncio.sleep(0.001)
+        if during == "playback":
+            while not manager.is_playing:
+                await asyncio.sleep(0.001)
+        else:
+            await asyncio.sleep(0.005)
+        manager.barge_in()
+    manager.audio_queue.close()
+
+
+def _barge_in_report(stats):
+    return {
+        "interrupted": stats["interrupted"],
+        "dropped": stats["dropped"],
+        "cancel_latency_mean_ms": (stats["mean_cancel_latency_seconds"] or 0) * 1000,
+        "cancel_latency_max_ms": stats["max_cancel_latency_seconds"] * 1000,
+        "scheduler": stats,
+    }
+
+
+async def _audio_barge_in_run(turns, idle_seconds, synth_seconds_per_char):
+    from benchmarks.fakes import FakeAudioManager
+
+    manager = FakeAudioManager(playback=True)
+    processor = asyncio.create_task(manager.process_audio_queue())
+
+    # An idle session should not wake the processor at all
+    await asyncio.sleep(idle_seconds)
+    idle_wakeups = manager.audio_queue.stats()["wakeups"]
+
+    await _barge_in_turns(manager, turns, "playback")
+    await processor
+    playback = _barge_in_report(manager.audio_queue.stats())
+
+    # Mid-synthesis, speech only stops once the worker thread finishes its
+    # current sentence, so latency here is bounded by one sentence
+    manager = FakeAudioManager(synth_seconds_per_char=synth_seconds_per_char, playback=True)
+    processor = asyncio.create_task(manager.process_audio_queue())
+    await _barge_in_turns(manager, turns, "synthesis")
+    await processor
+    synthesis = _barge_in_report(manager.audio_queue.stats())
+
+    return {
+        "idle_seconds": idle_seconds,
+        "idle_wakeups_per_second": idle_wakeups / idle_seconds,
+        "turns": turns,
+        "during_playback": playback,
+        "during_synthesis": synthesis,
+    }
+
+
+def bench_audio_barge_in(turns=50, idle_seconds=1.0, synth_seconds_per_char=0.0002):
+    """Idle wakeups and barge-in cancellation latency of the audio scheduler"""
+    try:
+        import benchmarks.fakes  # noqa: F401
+    except (ImportError, OSError) as e:
+        return skipped(str(e))
+    return asyncio.run(_audio_barge_in_run(turns, idle_seconds, synth_seconds_per_char))
+
+
+async def _tts_daemon_run(clients, requests_per_client, synth_seconds_per_char):
+    import tempfile
+    from benchmarks.fakes import FakeAudioManager
+    from src.models.tts_daemon import TTSClient, TTSDaemon
+
+    manager = FakeAudioManager(synth_seconds_per_char=synth_seconds_per_char)
+    texts = synthetic_statements(requests_per_client)
+    with tempfile.TemporaryDirectory() as tmp:
+        daemon = await TTSDaemon(manager, Path(tmp) / "tts.sock").start()
+        latencies = []
+
+        async def session(offset):
+            client = TTSClient(daemon.socket_path)
+            try:
+                for i in range(requests_per_client):
+                    start = time.perf_counter()
+                    async for _ in client.synthesize(texts[(i + offset) % len(texts)]):
+                        latencies.append(time.perf_counter() - start)
+                        break
+            finally:
+                await client.close()
+
+        # Burst: every client asks for one distinct sentence at the same moment.
+        # Sentences should come back one by one, not when the whole batch is done.
+        burst_latencies = []
+
+        async def burst_request(offset):
+            client = TTSClient(daemon.socket_path)
+            try:
+                start = time.perf_counter()
+                async for _ in client.synthesize(f"Burst {offset}: {texts[offset % len(texts)]}"):
+                    burst_latencies.append(time.perf_counter() - start)
+                    break
+            finally:
+                await client.close()
+
+        await asyncio.gather(*(burst_request(i) for i in range(min(clients, daemon.max_batch))))
+        burst_latencies.sort()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(session(i) for i in range(clients)))
+        elapsed = time.perf_counter() - start
+        stats = daemon.stats()
+        await daemon.stop()
+    latencies.sort()
+    return {
+        "clients": clients,
+        "requests": clients * requests_per_client,
+        "items_per_second": clients * requests_per_client / elapsed if elapsed else None,
+        "first_audio_p50_ms": percentile(latencies, 50) * 1000,
+        "first_audio_p95_ms": percentile(latencies, 95) * 1000,
+        "burst_first_audio_p50_ms": percentile(burst_latencies, 50) * 1000,
+        "burst_first_audio_max_ms": burst_latencies[-1] * 1000,
+        "synthesized": manager.generated,
+        "daemon": stats,
+    }
+
+
+def bench_tts_daemon(clients=16, requests_per_client=10, synth_seconds_per_char=0.0001):
+    """TTS daemon batching and dedup under concurrent clients, with a fake synthesizer"""
+    try:
+        import benchmarks.fakes  # noqa: F401
+        from src.models.tts_daemon import TTSDaemon  # noqa: F401
+    except (ImportError, OSError) as e:
+        return skipped(str(e))
+    if not hasattr(asyncio, "start_unix_server"):
+        return skipped("Unix sockets not supported on this platform")
+    return asyncio.run(_tts_daemon_run(clients, requests_per_client, synth_seconds_per_char))
+
+
+def _fake_phonemize(text, lang):
+    """Stand-in G2P with a fixed per-call cost, used when espeak is unavailable"""
+    time.sleep(0.002)
+    return " ".join(word.lower() for word in text.split())
+
+
+def bench_phoneme_cache(utterances=300, seed=2):
+    """Phoneme cache hit rate and G2P time saved on a game-like script"""
+    try:
+        from src.models.phoneme_cache import PhonemeCache
+    except ImportError as e:
+        return skipped(str(e))
+
+    g2p, phonemize = "fake", _fake_phonemize
+    try:
+        from src.utils.model_downloader import ModelDownloader
+        ModelDownloader.ensure_code_path()
+        from kokoro import phonemize
+        g2p = "kokoro"
+    except Exception:
+        pass
+
+    rng = random.Random(seed)
+    templates = [
+        "{who} was seen near the {where}.",
+        "The {what} was found in the {where}.",
+        "{who} insists the {what} never left the {where}.",
+        "Ask {who} about the {what}.",
+    ]
+    script = [
+        rng.choice(templates).format(
+            who=rng.choice(CHARACTERS), where=rng.choice(LOCATIONS), what=rng.choice(OBJECTS)
+        )
+        for _ in range(utterances)
+    ]
+
+    results = {}
+    for name, word_level in (("sentence_only", False), ("sentence_and_word", True)):
+        cache = PhonemeCache(phonemize, word_level=word_level)
+        start = time.perf_counter()
+        for line in script:
+            cache.phonemize(line, "a")
+        stats = cache.stats()
+        results[name] = {
+            "seconds": time.perf_counter() - start,
+            "hit_rate": stats["hit_rate"],
+            "misses": stats["misses"],
+            "g2p_seconds": stats["g2p_seconds"],
+            "g2p_seconds_saved": stats["g2p_seconds_saved"],
+        }
+    start = time.perf_counter()
+    for line in script:
+        phonemize(line, "a")
+    results["uncached_seconds"] = time.perf_counter() - start
+    results["g2p"] = g2p
+    return results
+
+
+def bench_kokoro_rtf(runs=3):
+    """KokoroManager real-time factor, only when model files are present"""
+    try:
+        from src.utils.model_downloader import ModelDownloader
+    except ImportError as e:
+        return skipped(str(e))
+
+    model_path = ModelDownloader.get_model_path(ensure_downloaded=False)
+    voice_path = ModelDownloader.get_voice_path(ensure_downloaded=False)
+    if not model_path.exists() or not voice_path.exists():
+        return skipped("Kokoro model or voice files not downloaded")
+
+    try:
+        from src.models.audio_model import KokoroManager
+    except (ImportError, OSError) as e:
+        return skipped(str(e))
+
+    async def run():
+        manager = KokoroManager()
+        texts = [
+            "The door to the study was locked from the inside.",
+            "Nobody could have entered the guest room after ten fifteen, yet the body was found there at dawn.",
+        ]
+        # Warm up once so lazy initialisation is not counted
+        await manager.generate_speech(texts[0], output_file=None)
+        per_text = {}
+        for text in texts:
+            synth, audio_seconds = 0.0, 0.0
+            for _ in range(runs):
+                start = time.perf_counter()
+                audio = await manager.generate_speech(text, output_file=None)
+                synth += time.perf_counter() - start
+                if audio is not None:
+                    audio_seconds += len(audio) / manager.sample_rate
+            per_text[str(len(text))] = {
+                "synthesis_seconds": synth / runs,
+                "audio_seconds": audio_seconds / runs,
+                "rtf": synth / audio_seconds if audio_seconds else None,
+            }
+        return {
+            "device": manager.device,
+            "by_text_chars": per_text,
+            "phoneme_cache": manager.phoneme_cache.stats(),
+            "voices": manager.voices.stats(),
+        }
+
+    return asyncio.run(run())
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_all(sizes, audio_items):
+    benchmarks = {
+        "contradiction_checker.check_statement": lambda: bench_contradiction_checker(sizes),
+        "truth_battle": lambda: bench_truth_battle(sizes),
+        "game_master.prompt_building": lambda: bench_prompt_building(sizes),
+        "evidence_graph": lambda: bench_evidence_graph(sizes),
+        "audio_queue.throughput": lambda: bench_audio_queue(audio_items),
+        "audio_queue.barge_in": bench_audio_barge_in,
+        "tts_daemon": bench_tts_daemon,
+        "phoneme_cache": bench_phoneme_cache,
+        "kokoro.rtf": bench_kokoro_rtf,
+    }
+    results = {}
+    for name, bench in benchmarks.items():
+        print(f"Running {name}...")
+        try:
+            results[name] = bench()
+        except Exception as e:
+            print(f"Benchmark {name} failed: {e}")
+            results[name] = {"error": str(e)}
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "sizes": sizes,
+        },
+        "results": results,
+    }
+
+
+def _flatten(results, prefix=""):
+    """Yield (path, value) for every numeric latency/throughput leaf"""
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from _flatten(value, path + ".")
+        elif isinstance(value, (int, float)) and key in ("p50_us", "rtf", "items_per_second"):
+            yield path, value
+
+
+def compare(baseline, current, threshold=0.2):
+    """Return metrics that regressed by more than threshold (as a fraction)"""
+    old = dict(_flatten(baseline.get("results", {})))
+    regressions = []
+    for path, value in _flatten(current.get("results", {})):
+        if path not in old or not old[path]:
+            continue
+        # Throughput is better when higher; everything else is better when lower
+        if path.endswith("items_per_second"):
+            change = (old[path] - value) / old[path]
+        else:
+            change = (value - old[path]) / old[path]
+        if change > threshold:
+            regressions.append({"metric": path, "baseline": old[path], "current": value, "change": change})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run offline component benchmarks")
+    parser.add_argument("--output", default="bench_results.json", help="Where to write the JSON report")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Comma separated truth-store sizes")
+    parser.add_argument("--audio-items", type=int, default=200, help="Items pushed through the audio queue")
+    parser.add_argument("--baseline", help="Previous report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown before flagging (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    report = run_all(sizes, args.audio_items)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report["regressions"] = compare(baseline, report, args.threshold)
+        for r in report["regressions"]:
+            print(f"REGRESSION {r['metric']}: {r['baseline']:.2f} -> {r['current']:.2f} ({r['change']:+.0%})")
+
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"Results written to {args.output}")
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+# benchmarks/bench_quantization.py
+"""
+Compare Kokoro fp32 and dynamic int8 inference on CPU.
+
+Usage:
+    python -m benchmarks.bench_quantization --output quant_results.json
+
+Reports real-time factor, memory (weights and process RSS growth) and how
+far the int8 audio drifts from the fp32 audio for the same text.
+Requires the Kokoro model files to be downloaded.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.bench_components import git_revision
+from benchmarks.load_test import current_rss_bytes
+
+TEXTS = [
+    "The door to the study was locked from the inside.",
+    "Nobody could have entered the guest room after ten fifteen, yet the body was found there at dawn.",
+    "I swear on my family's name that I never touched the master key.",
+]
+
+
+def log_spectral_distance(reference, candidate, frame=1024, hop=256):
+    """
+    Mean log-spectral distance in dB between two signals, over their common
+    length. Durations can differ slightly once the duration predictor is
+    quantized, so the length ratio is reported separately.
+    """
+    length = min(len(reference), len(candidate))
+    if length < frame:
+        return None
+    window = np.hanning(frame)
+
+    def spectrum(signal):
+        frames = np.lib.stride_tricks.sliding_window_view(signal[:length], frame)[::hop]
+        return np.abs(np.fft.rfft(frames * window, axis=-1))
+
+    ref, cand = spectrum(reference), spectrum(candidate)
+    # Floor both at -80 dB below the reference peak so near-silent bins don't dominate
+    floor = ref.max() * 1e-4 + 1e-12
+    ref_db = 20 * np.log10(np.maximum(ref, floor))
+    cand_db = 20 * np.log10(np.maximum(cand, floor))
+    return float(np.mean(np.sqrt(np.mean((ref_db - cand_db) ** 2, axis=-1))))
+
+
+def snr_db(reference, candidate):
+    """Signal-to-noise ratio of candidate against reference over their common length"""
+    length = min(len(reference), len(candidate))
+    noise = reference[:length] - candidate[:length]
+    power = np.sum(reference[:length] ** 2)
+    return float(10 * np.log10(power / max(np.sum(noise ** 2), 1e-12)))
+
+
+async def measure(quantize, runs):
+    from src.models.audio_model import KokoroManager
+    from src.models.quantization import model_size_bytes
+
+    gc.collect()
+    rss_before = current_rss_bytes()
+    start = time.perf_counter()
+    manager = KokoroManager(quantize=quantize)
+    load_seconds = time.perf_counter() - start
+    rss_after = current_rss_bytes()
+
+    # Warm up (and fill the phoneme cache so both modes time the same work)
+    for text in TEXTS:
+        await manager.generate_speech(text, output_file=None)
+
+    synth, audio_seconds, outputs = 0.0, 0.0, []
+    for text in TEXTS:
+        for _ in range(runs):
+            start = time.perf_counter()
+            audio = await manager.generate_speech(text, output_file=None)
+            synth += time.perf_counter() - start
+        audio_seconds += runs * len(audio) / manager.sample_rate
+        outputs.append(np.asarray(audio, dtype=np.float32))
+
+    result = {
+        "load_seconds": load_seconds,
+        "rss_growth_bytes": rss_after - rss_before,
+        "weights_bytes": model_size_bytes(manager.model),
+        "synthesis_seconds": synth,
+        "audio_seconds": audio_seconds,
+        "rtf": synth / audio_seconds if audio_seconds else None,
+    }
+    del manager
+    gc.collect()
+    return result, outputs
+
+
+async def run(runs):
+    import torch
+
+    # Match a CPU-only host even when a GPU is present
+    torch.cuda.is_available = lambda: False
+
+    fp32, fp32_audio = await measure(False, runs)
+    int8, int8_audio = await measure(True, runs)
+    diffs = [
+        {
+            "text_chars": len(text),
+            "log_spectral_distance_db": log_spectral_distance(ref, cand),
+            "snr_db": snr_db(ref, cand),
+            "length_ratio": len(cand) / len(ref),
+        }
+        for text, ref, cand in zip(TEXTS, fp32_audio, int8_audio)
+    ]
+    return {
+        "fp32": fp32,
+        "int8": int8,
+        "speedup": fp32["rtf"] / int8["rtf"] if int8["rtf"] else None,
+        "weights_ratio": int8["weights_bytes"] / fp32["weights_bytes"],
+        "audio_difference": diffs,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Kokoro fp32 vs int8 on CPU")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per text")
+    parser.add_argument("--output", default="quant_results.json")
+    args = parser.parse_args(argv)
+
+    from src.utils.model_downloader import ModelDownloader
+    if not ModelDownloader.get_model_path(ensure_downloaded=False).exists():
+        print("Kokoro model not downloaded; run the game once or use ModelDownloader first.")
+        return 1
+
+    report = {"meta": {"git_revision": git_revision()}, "results": asyncio.run(run(args.runs))}
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    results = report["results"]
+    print(f"fp32 RTF {results['fp32']['rtf']:.3f}, int8 RTF {results['int8']['rtf']:.3f}, "
+          f"weights {results['weights_ratio']:.0%} of fp32")
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+import asyncio
+import threading
+import time
+import numpy as np
+from src.models.audio_model import KokoroManager
+
+
+class FakeAudioManager(KokoroManager):
+    """KokoroManager that skips model loading and fakes synthesis/playback"""
+
+    def __init__(self, synth_seconds_per_char=0.0, playback=False, sample_rate=24000):
+        """
+        Args:
+            synth_seconds_per_char: Simulated synthesis cost, slept in a worker thread
+            playback: If True, sleep for the duration of the fake audio
+            sample_rate: Sample rate of the generated silence
+        """
+        self.synth_seconds_per_char = synth_seconds_per_char
+        self.playback = playback
+        self.sample_rate = sample_rate
+        self.voice_name = 'af'
+        self.stream_server = None
+        self.phoneme_cache = None
+        self._synthesis_lock = threading.Lock()
+
+        self._setup_queue()
+
+        self.generated = 0
+        self.played = 0
+
+    async def generate_speech(self, text, output_file=None, voice=None, cancel=None):
+        """Return silence roughly as long as the text would take to speak"""
+        if self.synth_seconds_per_char:
+            return await super().generate_speech(text, output_file=None, voice=voice, cancel=cancel)
+        return self._synthesize_text(text, voice, cancel)
+
+    def _synthesize(self, text, voice=None):
+        """Blocking fake synthesis, as called from worker threads (e.g. by TTSDaemon)"""
+        with self._synthesis_lock:
+            if self.synth_seconds_per_char:
+                time.sleep(self.synth_seconds_per_char * len(text))
+            self.generated += 1
+        # ~15 characters per second of speech
+        return np.zeros(int(self.sample_rate * len(text) / 15), dtype=np.float32), None
+
+    async def play_audio(self, audio_data):
+        """Pretend to play audio_data"""
+        self.is_playing = True
+        try:
+            if self.playback:
+                await asyncio.sleep(len(audio_data) / self.sample_rate)
+            self.played += 1
+        finally:
+            self.is_playing = False
@@ -0,0 +1,288 @@
+# benchmarks/load_test.py
+"""
+End-to-end load generator for GameMaster.
+
+Scripted bot players drive concurrent GameMaster sessions against a local
+mock LLM server while concurrency ramps up. For every level the report
+contains turn latency percentiles, throughput, event-loop lag and memory
+per session.
+
+Usage:
+    python -m benchmarks.load_test --levels 1,4,16,64 --latency 0.8 --tts fake
+    python -m benchmarks.load_test --transcript transcripts.json --slo 3.0
+
+A transcript file is a JSON list of turns ({"action": ..., "content": ...})
+or a list of such lists; sessions replay them round-robin.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import resource
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.bench_components import git_revision, percentile
+from benchmarks.mock_llm import MockLLMServer
+from src.game.game_master import GameMaster
+from src.game.mystery_pool import MysteryPool
+from src.models.truth_model import TruthModel
+
+DEFAULT_TRANSCRIPTS = [
+    [
+        {"action": "question", "content": "Who discovered the first body?"},
+        {"action": "question", "content": "Was the study door locked when the body was found?"},
+        {"action": "theory", "content": "Eva used the master key to lock the study from outside."},
+        {"action": "question", "content": "Where was Kinzo at 10:15 PM?"},
+        {"action": "theory", "content": "The magic circles were drawn after the second murder."},
+    ],
+    [
+        {"action": "question", "content": "What was found in the guest room?"},
+        {"action": "theory", "content": "Nobody entered the guest room after 10 PM."},
+        {"action": "question", "content": "Who had access to the master key?"},
+        {"action": "theory", "content": "The witch did not commit the murders."},
+    ],
+]
+
+
+def load_transcripts(path):
+    """Load one transcript or a list of transcripts from a JSON file"""
+    with open(path) as f:
+        data = json.load(f)
+    if data and isinstance(data[0], dict):
+        data = [data]
+    return data
+
+
+def current_rss_bytes():
+    """Resident set size of this process; falls back to peak RSS off Linux"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        # ru_maxrss is kilobytes on Linux and bytes on macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+class LoopMonitor:
+    """Samples event-loop lag and process RSS while a level runs"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.lags = []
+        self.peak_rss = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, loop.time() - expected))
+            self.peak_rss = max(self.peak_rss, current_rss_bytes())
+
+
+def make_audio_manager(tts):
+    if tts == "fake":
+        from benchmarks.fakes import FakeAudioManager
+        return FakeAudioManager(playback=True)
+    if tts == "real":
+        from src.models.audio_model import KokoroManager
+        return KokoroManager()
+    return None
+
+
+async def run_session(transcript, tts, turn_latencies, route_stats, mystery_pool=None):
+    """Play one game: opening, the scripted turns, then end_game"""
+    game = GameMaster(audio_manager=make_audio_manager(tts), mystery_pool=mystery_pool)
+    start = time.perf_counter()
+    await game.start_game()
+    opening = time.perf_counter() - start
+
+    for turn in transcript:
+        start = time.perf_counter()
+        await game.handle_turn(turn["action"], turn["content"])
+        turn_latencies.append(time.perf_counter() - start)
+
+    await game.end_game()
+    await game.model.close()
+    route_stats.append(game.model.router.stats())
+    return opening
+
+
+def merge_route_stats(per_session):
+    """Sum per-session ModelRouter stats into one report per route"""
+    merged = {}
+    for stats in per_session:
+        for name, route in stats.items():
+            total = merged.setdefault(name, {
+                "model": route["model"], "calls": 0, "errors": 0, "escalations": 0,
+                "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0, "latency_total_s": 0.0,
+            })
+            for key in ("calls", "errors", "escalations", "input_tokens", "output_tokens", "cost_usd"):
+                total[key] += route[key]
+            if route["calls"]:
+                total["latency_total_s"] += route["mean_latency_s"] * route["calls"]
+    for total in merged.values():
+        latency_total = total.pop("latency_total_s")
+        total["mean_latency_s"] = latency_total / total["calls"] if total["calls"] else None
+    return merged
+
+
+async def run_level(concurrency, transcripts, tts, rounds, pool_size=0):
+    """Run `concurrency` sessions at once, `rounds` games per slot"""
+    turn_latencies, openings, route_stats = [], [], []
+
+    pool = None
+    if pool_size:
+        # Start from a warm pool, as a long-running server would
+        pool = MysteryPool(TruthModel(), target_size=pool_size, max_concurrency=pool_size).start()
+        await pool.wait_filled(timeout=60)
+
+    async def slot(slot_id):
+        for r in range(rounds):
+            session_id = slot_id * rounds + r
+            transcript = transcripts[session_id % len(transcripts)]
+            openings.append(await run_session(transcript, tts, turn_latencies, route_stats, pool))
+
+    gc.collect()
+    baseline_rss = current_rss_bytes()
+    monitor = LoopMonitor()
+    monitor.start()
+    start = time.perf_counter()
+    results = await asyncio.gather(*(slot(i) for i in range(concurrency)), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    await monitor.stop()
+    pool_stats = None
+    if pool is not None:
+        pool_stats = pool.stats()
+        await pool.stop()
+        # Left to the garbage collector, its sockets get closed under a later level
+        await pool.model.close()
+
+    errors = [repr(r) for r in results if isinstance(r, Exception)]
+    turns = sorted(turn_latencies)
+    lags = sorted(monitor.lags)
+    return {
+        "concurrency": concurrency,
+        "sessions": concurrency * rounds,
+        "errors": errors[:5],
+        "error_count": len(errors),
+        "turns": len(turns),
+        "seconds": elapsed,
+        "turns_per_second": len(turns) / elapsed if elapsed else None,
+        "turn_latency_s": {
+            "p50": percentile(turns, 50),
+            "p95": percentile(turns, 95),
+            "p99": percentile(turns, 99),
+            "mean": statistics.fmean(turns) if turns else None,
+        },
+        "opening_latency_s": {
+            "p50": percentile(sorted(openings), 50),
+            "p95": percentile(sorted(openings), 95),
+        },
+        "event_loop_lag_s": {
+            "p50": percentile(lags, 50),
+            "p99": percentile(lags, 99),
+            "max": lags[-1] if lags else None,
+        },
+        "memory_per_session_bytes": max(0, monitor.peak_rss - baseline_rss) / concurrency,
+        "routes": merge_route_stats(route_stats),
+        "mystery_pool": pool_stats,
+    }
+
+
+async def ramp(levels, transcripts, tts, rounds, slo, pool_size=0):
+    reports = []
+    for concurrency in levels:
+        print(f"Running {concurrency} concurrent session(s)...")
+        report = await run_level(concurrency, transcripts, tts, rounds, pool_size)
+        reports.append(report)
+        latency = report["turn_latency_s"]
+        print(f"  p50={latency['p50']:.3f}s p95={latency['p95']:.3f}s p99={latency['p99']:.3f}s "
+              f"throughput={report['turns_per_second']:.1f} turns/s "
+              f"loop lag p99={report['event_loop_lag_s']['p99']:.4f}s "
+              f"errors={report['error_count']}")
+        if slo is not None and (latency["p95"] is None or latency["p95"] > slo or report["error_count"]):
+            print(f"  p95 above SLO of {slo}s, stopping ramp")
+            break
+    return reports
+
+
+def max_sustainable(reports, slo):
+    """Highest concurrency whose p95 stayed under slo without errors"""
+    if slo is None:
+        return None
+    passing = [r["concurrency"] for r in reports
+               if not r["error_count"] and r["turn_latency_s"]["p95"] is not None
+               and r["turn_latency_s"]["p95"] <= slo]
+    return max(passing) if passing else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test GameMaster with scripted players")
+    parser.add_argument("--levels", default="1,2,4,8,16,32", help="Comma separated concurrency levels")
+    parser.add_argument("--rounds", type=int, default=1, help="Games played back to back per session slot")
+    parser.add_argument("--latency", type=float, default=0.5, help="Mock LLM base latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Mock LLM extra random latency in seconds")
+    parser.add_argument("--tts", choices=["none", "fake", "real"], default="fake")
+    parser.add_argument("--transcript", help="JSON file with player transcripts to replay")
+    parser.add_argument("--slo", type=float, help="Stop ramping once p95 turn latency exceeds this (seconds)")
+    parser.add_argument("--pool-size", type=int, default=0,
+                        help="Serve openings from a pre-generated mystery pool of this size (0 = off)")
+    parser.add_argument("--llm-url", help="Use an already running LLM endpoint instead of the mock")
+    parser.add_argument("--output", default="load_results.json")
+    args = parser.parse_args(argv)
+
+    levels = [int(x) for x in args.levels.split(",") if x]
+    transcripts = load_transcripts(args.transcript) if args.transcript else DEFAULT_TRANSCRIPTS
+
+    server = None
+    if args.llm_url:
+        os.environ["ANTHROPIC_BASE_URL"] = args.llm_url
+    else:
+        server = MockLLMServer(latency=args.latency, jitter=args.jitter).start()
+        os.environ["ANTHROPIC_BASE_URL"] = server.base_url
+    os.environ.setdefault("ANTHROPIC_API_KEY", "load-test")
+
+    try:
+        reports = asyncio.run(ramp(levels, transcripts, args.tts, args.rounds, args.slo, args.pool_size))
+    finally:
+        if server is not None:
+            server.stop()
+
+    result = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "tts": args.tts,
+            "llm": args.llm_url or {"mock_latency_s": args.latency, "mock_jitter_s": args.jitter},
+            "rounds": args.rounds,
+            "mystery_pool_size": args.pool_size,
+            "slo_p95_s": args.slo,
+            "llm_requests": server.requests_served if server else None,
+        },
+        "max_sustainable_concurrency": max_sustainable(reports, args.slo),
+        "levels": reports,
+    }
+    Path(args.output).write_text(json.dumps(result, indent=2))
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# benchmarks/mock_llm.py
+"""
+Minimal local stand-in for the Anthropic Messages API.
+
+Runs on its own thread and event loop so that its work never shows up as
+lag on the event loop being measured. Point the Anthropic client at it
+with ANTHROPIC_BASE_URL=server.base_url.
+"""
+import asyncio
+import json
+import random
+import threading
+import time
+
+RESPONSES = [
+    "「The study door was locked from the inside at 9:30 PM.」 The rain kept hammering the windows.",
+    "「Nobody left the mansion after the storm began.」 A faint smell of candle wax lingered in the hall.",
+    "「The master key never left Kinzo's desk drawer.」 Yet the guest room was found sealed.",
+    "The servants whisper about the witch's portrait. 「The magic circle was drawn after 10:15 PM.」",
+]
+
+
+class MockLLMServer:
+    """Serves canned /v1/messages replies after a configurable delay"""
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.5, jitter=0.0, seed=0):
+        """
+        Args:
+            latency: Base seconds to wait before replying
+            jitter: Extra uniformly random seconds added to each reply
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.requests_served = 0
+        self._rng = random.Random(seed)
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """Start serving in a background thread"""
+        self._thread = threading.Thread(target=self._run, name="mock-llm", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        """Stop the server and join its thread"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port)
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            # Cancel handlers still parked on keep-alive connections
+            pending = asyncio.all_tasks(self._loop)
+            for task in pending:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            self._server.close()
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+    async def _handle(self, reader, writer):
+        """Serve keep-alive HTTP/1.1 requests until the client disconnects"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload = await self._respond(request_line.decode("latin-1"), body)
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    "\r\n".encode() + data
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            # Client went away, or the server is shutting down
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, request_line, body):
+        method, path, _ = request_line.split(" ", 2)
+        if method != "POST" or not path.startswith("/v1/messages"):
+            return "404 Not Found", {"type": "error", "error": {"type": "not_found_error", "message": path}}
+
+        request = json.loads(body or b"{}")
+        await asyncio.sleep(self.latency + self._rng.uniform(0, self.jitter))
+
+        self.requests_served += 1
+        text = RESPONSES[self.requests_served % len(RESPONSES)]
+        prompt_chars = sum(len(str(m.get("content", ""))) for m in request.get("messages", []))
+        return "200 OK", {
+            "id": f"msg_mock_{self.requests_served}",
+            "type": "message",
+            "role": "assistant",
+            "model": request.get("model", "mock"),
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            # Roughly four characters per token
+            "usage": {"input_tokens": prompt_chars // 4, "output_tokens": len(text) // 4},
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a mock Anthropic Messages API server")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with MockLLMServer(port=args.port, latency=args.latency, jitter=args.jitter) as server:
+        print(f"Mock LLM listening on {server.base_url}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
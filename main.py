@@ -2,6 +2,8 @@
 import asyncio
 import os
 from  src.game.game_master import GameMaster
+from src.game.mystery_pool import MysteryPool
+from src.models.truth_model import TruthModel
 from dotenv import load_dotenv
 
 if os.path.exists('.env'):
@@ -14,7 +16,14 @@ if not os.getenv("ANTHROPIC_API_KEY"):
     raise ValueError("Missing required API keys. Please check your .env or .env.example file.")
 
 async def main():
-    game = GameMaster()
+    # Openings are pre-generated in the background and kept on disk, so the
+    # next game (in this or a later run) starts without waiting on the LLM
+    pool = MysteryPool(
+        TruthModel(),
+        target_size=int(os.getenv("MYSTERY_POOL_SIZE", "2")),
+        persist_path=os.getenv("MYSTERY_POOL_FILE", "mystery_pool.json")
+    ).start()
+    game = GameMaster(mystery_pool=pool)
     
     # Start the game
     print("\n=== Welcome to the Detective Mystery Game ===")
@@ -52,6 +61,7 @@ async def main():
     truth = game.end_game()
     print("\nThe truth behind the mystery:")
     print(truth)
+    await pool.stop()
 
 if __name__ == "__main__":
     # Run the game
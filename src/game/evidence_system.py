@@ -1,31 +1,227 @@
 # src/game/evidence_system.py
-class EvidenceSystem:
-    def __init__(self):
-        self.core_truth = {
-            "actual_events": {
-                "killer": "Eva",
-                "motive": "inheritance dispute",
-                "method": "Used master key to create locked rooms",
-                "timeline": {
-                    "first_murder": "9:30 PM - Study",
-                    "second_murder": "10:15 PM - Guest Room",
-                    "evidence_planted": "10:45 PM - Magic circles drawn"
-                }
-            }
+import copy
+import re
+import time
+from src.utils.evidence_graph import EvidenceGraph
+
+# Rooms of the mansion, known up front so lowercase mentions are indexed
+LOCATIONS = ["study", "library", "bedroom", "kitchen", "garden", "guest room", "chapel"]
+
+_SPEECH_VERBS = r"(?:says|said|insists|insisted|claims|claimed|replies|replied|whispers|whispered)"
+_QUOTE = r"[\"“]([^\"”]+)[\"”]"
+# A quote ending in a comma, ? or ! can be attributed after it: "Yes," said Eva
+_TAGGED_QUOTE = r"[\"“]([^\"”]*[^\"”.\s])[\"”],?\s+"
+_ATTRIBUTION = rf"(?:{_SPEECH_VERBS}\s+[A-Z][a-z]+|[A-Z][a-z]+\s+{_SPEECH_VERBS}\b)"
+# "...," said Eva  /  "...," Eva whispered  /  Eva says, "..."  /  Eva: "..."
+# The last form only counts when the quote is not attributed right after
+# it ('Later, "...," said Eva' is Eva's line, not Later's).
+WITNESS_QUOTE_PATTERN = re.compile(
+    rf"{_TAGGED_QUOTE}{_SPEECH_VERBS}\s+([A-Z][a-z]+)"
+    rf"|{_TAGGED_QUOTE}([A-Z][a-z]+)\s+{_SPEECH_VERBS}\b"
+    rf"|\b([A-Z][a-z]+)(\s+{_SPEECH_VERBS})?\s*[,:]\s*"
+    rf"(?![\"“][^\"”]*[^\"”.\s][\"”],?\s+{_ATTRIBUTION}){_QUOTE}"
+)
+_RED_TRUTH = re.compile(r"「[^」]*」")
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+DEFAULT_CORE_TRUTH = {
+    "actual_events": {
+        "killer": "Eva",
+        "motive": "inheritance dispute",
+        "method": "Used master key to create locked rooms",
+        "timeline": {
+            "first_murder": "9:30 PM - Study",
+            "second_murder": "10:15 PM - Guest Room",
+            "evidence_planted": "10:45 PM - Magic circles drawn"
         }
-        
+    }
+}
+
+
+class EvidenceSystem:
+    def __init__(self, core_truth=None):
+        self.core_truth = copy.deepcopy(core_truth or DEFAULT_CORE_TRUTH)
+
         self.established_facts = {
             "red_truths": set(),
             "physical_evidence": {},
-            "witness_statements": {},
+            "witness_statements": {},  # Latest statement per witness
             "contradictions_found": []
         }
-    
+        # Every statement each witness has given, oldest first
+        self.statement_history = {}
+        # Each witness's statements that no later statement has revised
+        self._current_statements = {}
+        self._narration = set()
+        self.graph = EvidenceGraph()
+        self._register_entities()
+
+    def _register_entities(self):
+        """
+        Teach the graph the case's names and places. Only the vocabulary is
+        taken from the core truth; it is never added as a fact, so it cannot
+        leak into prompts built from the graph.
+        """
+        self.graph.add_entity("character", self.core_truth["actual_events"]["killer"])
+        for location in LOCATIONS:
+            self.graph.add_entity("location", location)
+
     def add_evidence(self, evidence_type, detail):
         if evidence_type == "physical":
             self.established_facts["physical_evidence"][detail["name"]] = detail
+            self.graph.add_fact(
+                "evidence", detail["name"], detail.get("description", ""),
+                links=[("object", detail["name"])] + self._detail_links(detail),
+                name=detail["name"]
+            )
             return f"Evidence added: {detail['name']}"
-            
+
         elif evidence_type == "statement":
-            self.established_facts["witness_statements"][detail["who"]] = detail["says"]
-            return f"Statement recorded from {detail['who']}"
\ No newline at end of file
+            who, says = detail["who"], detail["says"]
+            history = self.statement_history.setdefault(who, [])
+            current = self._current_statements.setdefault(who, [])
+            if any(self.graph.nodes[node]["text"] == says for node in current):
+                return f"Statement recorded from {who}"
+
+            number = len(history) + 1
+            node = self.graph.add_fact(
+                "statement", f"{who}#{number}", says,
+                links=[("character", who)] + self._detail_links(detail),
+                who=who, version=1, source="witness"
+            )
+            revised = [old for old in current if detail.get("revises") or self._same_subject(who, old, node)]
+            version = 1 + max((self.graph.nodes[old]["version"] for old in revised), default=0)
+            for old in revised:
+                self.graph.supersede(old)
+                current.remove(old)
+            current.append(node)
+            self.graph.nodes[node]["version"] = version
+            history.append({
+                "version": version,
+                "says": says,
+                "timestamp": time.time(),
+                **{key: detail[key] for key in ("location", "time") if key in detail}
+            })
+            self.established_facts["witness_statements"][who] = says
+            if revised:
+                return f"Statement from {who} changed (version {version})"
+            return f"Statement recorded from {who}"
+
+    def _same_subject(self, who, old, new):
+        """
+        Whether two statements by who are about the same thing, so the newer
+        one replaces the older: they name the same time, or neither is tied
+        to a time and they share a place, person or object.
+        """
+        witness = self.graph.entity(who)
+        old_entities = self.graph.neighbors(old) - {witness}
+        new_entities = self.graph.neighbors(new) - {witness}
+        old_times = {node for node in old_entities if node[0] == "time"}
+        new_times = {node for node in new_entities if node[0] == "time"}
+        if old_times or new_times:
+            return bool(old_times & new_times)
+        return bool(old_entities & new_entities)
+
+    def _detail_links(self, detail):
+        """Explicit entity links carried in an evidence detail dict"""
+        links = []
+        for key, kind in (("location", "location"), ("time", "time"), ("owner", "character")):
+            if detail.get(key):
+                links.append((kind, detail[key]))
+        links += [("character", name) for name in detail.get("characters", [])]
+        links += [("object", name) for name in detail.get("objects", [])]
+        return links
+
+    def record_red_truth(self, statement):
+        """Index a (canonical) red truth alongside the evidence"""
+        if statement in self.established_facts["red_truths"]:
+            return
+        self.established_facts["red_truths"].add(statement)
+        self.graph.add_fact(
+            "statement", f"red#{len(self.established_facts['red_truths'])}", statement,
+            source="red_truth"
+        )
+
+    def record_narration(self, text):
+        """
+        Index what the narrator said: quoted witness lines become (versioned)
+        statements, the remaining sentences narration facts. Red truths are
+        skipped; they are indexed through record_red_truth().
+        """
+        text = _RED_TRUTH.sub(" ", text or "")
+        results = []
+        parts, last = [], 0
+        for match in WITNESS_QUOTE_PATTERN.finditer(text):
+            quote = self._witness_quote(match)
+            if quote is None:
+                continue
+            who, says = quote
+            results.append(self.add_evidence("statement", {"who": who, "says": says.strip().rstrip(",")}))
+            parts.append(text[last:match.start()])
+            last = match.end()
+        text = " ".join(parts + [text[last:]])
+
+        for sentence in _SENTENCE_BOUNDARY.split(" ".join(text.split())):
+            if len(sentence.split()) < 3 or sentence in self._narration:
+                continue
+            self._narration.add(sentence)
+            self.graph.add_fact("statement", f"narration#{len(self._narration)}", sentence, source="narration")
+        return results
+
+    def _witness_quote(self, match):
+        """
+        (who, says) for a WITNESS_QUOTE_PATTERN match, or None when the
+        speaker is just a capitalized word ('Later, "..."'): a bare Name: or
+        Name, form needs a known character.
+        """
+        if match.group(1):
+            return match.group(2), match.group(1)
+        if match.group(3):
+            return match.group(4), match.group(3)
+        who = match.group(5)
+        if not match.group(6):
+            node = self.graph.entity(who)
+            if node is None or node[0] != "character":
+                return None
+        return who, match.group(7)
+
+    def links_between(self, *names, after=None, before=None):
+        """
+        Every statement and piece of evidence tied to all the named entities,
+        e.g. links_between("Eva", "study", after="9 PM"). Earlier versions
+        of changed statements are included; check each fact's "current".
+        """
+        return self.graph.linking(*names, after=after, before=before)
+
+    def relevant_facts(self, text, limit=None):
+        """
+        Evidence sharing characters, places, times or objects with text, in
+        the shape of established_facts (which ContradictionChecker accepts)
+        """
+        facts = {"red_truths": [], "physical_evidence": {}, "witness_statements": {}, "narration": []}
+        for fact in self.graph.relevant(text, limit=limit):
+            if fact["kind"] == "evidence":
+                facts["physical_evidence"][fact["name"]] = self.established_facts["physical_evidence"][fact["name"]]
+            elif fact["source"] == "red_truth":
+                facts["red_truths"].append(fact["text"])
+            elif fact["source"] == "narration":
+                facts["narration"].append(fact["text"])
+            else:
+                facts["witness_statements"].setdefault(fact["who"], fact["text"])
+        return facts
+
+    def format_relevant(self, text, limit=8):
+        """Compact evidence lines related to text, for prompts (red truths excluded)"""
+        lines = []
+        for fact in self.graph.relevant(text, include_unlinked=False):
+            if fact["kind"] == "evidence":
+                description = fact["text"] or "no description"
+                lines.append(f"- Evidence: {fact['name']}: {description}")
+            elif fact["source"] == "witness":
+                revised = f" (changed story, version {fact['version']})" if fact["version"] > 1 else ""
+                lines.append(f"- {fact['who']} says{revised}: {fact['text']}")
+            elif fact["source"] == "narration":
+                lines.append(f"- Narrated: {fact['text']}")
+            if len(lines) == limit:
+                break
+        return "\n".join(lines)
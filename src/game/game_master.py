@@ -1,44 +1,69 @@
 # src/game/game_master.py
 import asyncio
-from src.models.base_model import BaseModel
+import re
+from src.models.base_model import ERROR_RESPONSE
+from src.models.truth_model import TruthModel
+from src.utils.contradiction_checker import ContradictionChecker
+from .evidence_system import EvidenceSystem
+from .mystery_pool import opening_prompt
 from .truth_battle import TruthBattleSystem
 
+RED_TRUTH_PATTERN = re.compile(r"「([^」]+)」")
+
 class GameMaster:
-    def __init__(self):
-        self.model = BaseModel()
+    def __init__(self, audio_manager=None, routes=None, mystery_pool=None):
+        self.model = TruthModel(routes=routes)
         self.truth_battle = TruthBattleSystem()
+        self.evidence = EvidenceSystem()
+        # Optional shared MysteryPool of pre-generated openings
+        self.mystery_pool = mystery_pool
+        self.contradiction_checker = ContradictionChecker(truth_index=self.truth_battle.truth_index)
         self.turns_remaining = 10
+        self.audio_manager = audio_manager
+        self.audio_task = None
         # Start audio processing task
-        self.audio_task = asyncio.create_task(self.audio_manager.process_audio_queue())
+        if self.audio_manager is not None:
+            self.audio_task = asyncio.create_task(self.audio_manager.process_audio_queue())
         
-    async def _speak_response(self, response):
-        """Queue response for audio playback and return the text"""
-        if response:
-            await self.audio_manager.queue_audio(response)
+    async def _speak_response(self, response, voice=None):
+        """Queue response for audio playback (in voice, if given) and return the text"""
+        if response and self.audio_manager is not None:
+            await self.audio_manager.queue_audio(response, voice=voice)
             # Give a short time for audio to start processing
             await asyncio.sleep(0.1)
         return response
         
     async def start_game(self):
-        """Start the game with an opening narrative"""
-        opening_context = """
-        Present a mysterious series of murders on an isolated island.
-        Include supernatural elements but leave subtle hints toward
-        a logical explanation.
-        """
-        return await self.model.generate_response(opening_context)
+        """Start the game with an opening narrative, pre-generated when the pool has one"""
+        mystery = self.mystery_pool.take() if self.mystery_pool is not None else None
+        if mystery is not None:
+            self.evidence = EvidenceSystem(core_truth=mystery["core_truth"])
+            response = mystery["opening"]
+        else:
+            response = await self.model.generate_response(
+                opening_prompt(self.evidence.core_truth), action="opening"
+            )
+        return self._process_response(response)
 
     async def handle_turn(self, action, content):
+        # The player has moved on: stale narration from the last turn stops now
+        if self.audio_manager is not None:
+            self.audio_manager.barge_in()
+
         if action == "question":
             context = self._build_question_context(content)
-            response = await self.model.generate_response(context)
+            response = await self.model.generate_response(
+                context, action="question", validate=self._is_valid_answer
+            )
+            response = self._process_response(response)
             self.turns_remaining -= 1
             await self._speak_response(response)
             return response
             
         elif action == "theory":
             theory = self.truth_battle.present_blue_theory(content)
-            response = await self._handle_theory_challenge(theory)
+            theory_id = len(self.truth_battle.blue_theories) - 1
+            response = await self._resolve_theory(theory_id, content, theory)
             self.turns_remaining -= 1
             await self._speak_response(response)
             return response
@@ -46,27 +71,104 @@ class GameMaster:
         self.turns_remaining -= 1
         return self.check_game_state()
     
-    # TODO: not clear what we should do with this block
     def _process_response(self, response):
+        """Record the 「red truths」, witness statements and narration in response"""
+        if not self._is_valid_answer(response):
+            return response
+        for statement in RED_TRUTH_PATTERN.findall(response):
+            known = len(self.truth_battle.red_truths)
+            self.truth_battle.declare_red_truth(statement.strip(), source="narrator")
+            # Paraphrases merge into an existing truth; only index new ones
+            if len(self.truth_battle.red_truths) > known:
+                self.evidence.record_red_truth(statement.strip())
+        self.evidence.record_narration(response)
         return response
     
     def _build_question_context(self, question):
         return f"""
         Based on established facts:
+        {self.evidence.format_relevant(question)}
         
         Answer the question: {question}
+        Quote characters as Name: "their words".
         
         Maintain consistency with red truths:
-        {self.truth_battle.red_truths}
+        {self.truth_battle.format_red_truths()}
         """
     
+    def _established_facts(self, statement=None):
+        """
+        Canonical red truths in the shape ContradictionChecker expects, plus
+        the evidence related to statement. All red truths are always kept:
+        the local check must not miss one that shares no entity.
+        """
+        facts = self.evidence.relevant_facts(statement, limit=20) if statement else {}
+        facts["red_truths"] = [truth["statement"] for truth in self.truth_battle.red_truths.values()]
+        return facts
+    
+    async def _resolve_theory(self, theory_id, content, theory):
+        """
+        Settle a theory locally when it plainly violates a red truth;
+        otherwise run LLM validation and the narrative challenge concurrently.
+        """
+        record = self.truth_battle.blue_theories[theory_id]
+        contradictions = self.contradiction_checker.check_statement(content, self._established_facts(content))
+        if contradictions:
+            record["status"] = "refuted"
+            record["contradictions"] = contradictions
+            return self._format_refutation(contradictions)
+        
+        validation, challenge = await asyncio.gather(
+            self.model.validate_theory(content, self.truth_battle.format_red_truths()),
+            self._handle_theory_challenge(theory)
+        )
+        challenge = self._process_response(challenge)
+        verdict, details = self._parse_validation(validation)
+        record["status"] = "refuted" if verdict == "CONTRADICTS" else "challenged"
+        if verdict == "CONTRADICTS" and details:
+            return f"{challenge}\n\n{details}"
+        return challenge
+    
+    def _format_refutation(self, contradictions):
+        """Answer a locally refuted theory with the red truths it breaks"""
+        facts = []
+        for contradiction in contradictions:
+            fact = contradiction["details"].get("conflicting_fact")
+            if fact and fact not in facts:
+                facts.append(fact)
+        lines = [f"「{fact}」" for fact in facts]
+        lines.append("Your theory cannot stand against the red truth.")
+        return "\n".join(lines)
+    
+    def _parse_validation(self, validation):
+        """Split a validate_theory reply into (VALID|CONTRADICTS|None, details)"""
+        if not self._is_valid_answer(validation):
+            return None, ""
+        first_line, _, rest = validation.strip().partition("\n")
+        verdict = first_line.strip().upper().strip(".:")
+        if verdict not in ("VALID", "CONTRADICTS"):
+            return None, validation.strip()
+        return verdict, rest.strip()
+    
     async def _handle_theory_challenge(self, theory):
         context = f"""
         Player theory: {theory}
         You must respond with at least {self.truth_battle.facts_required} red truths.
         Use 「」 for red truths.
         """
-        return await self.model.generate_response(context)
+        return await self.model.generate_response(
+            context, action="theory_challenge", validate=self._is_valid_challenge
+        )
+    
+    def _is_valid_answer(self, response):
+        """Local check before escalating a question to a bigger model"""
+        return bool(response and response.strip()) and response != ERROR_RESPONSE
+    
+    def _is_valid_challenge(self, response):
+        """A theory challenge must carry the required number of red truths"""
+        if not self._is_valid_answer(response):
+            return False
+        return len(RED_TRUTH_PATTERN.findall(response)) >= self.truth_battle.facts_required
     
     def check_game_state(self):
         if self.turns_remaining <= 0:
@@ -76,11 +178,11 @@ class GameMaster:
     async def end_game(self):
         """Clean up and end the game"""
         # Stop audio processing
-        if hasattr(self, 'audio_manager'):
+        if getattr(self, 'audio_manager', None) is not None:
             await self.audio_manager.stop_audio()
         
         # Cancel audio task
-        if hasattr(self, 'audio_task'):
+        if getattr(self, 'audio_task', None) is not None:
             try:
                 self.audio_task.cancel()
                 await self.audio_task
@@ -95,5 +197,5 @@ class GameMaster:
 
     def __del__(self):
         """Ensure cleanup on object destruction"""
-        if hasattr(self, 'audio_manager'):
+        if getattr(self, 'audio_manager', None) is not None:
             asyncio.create_task(self.audio_manager.stop_audio())
\ No newline at end of file
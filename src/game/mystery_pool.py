@@ -0,0 +1,172 @@
+# src/game/mystery_pool.py
+import asyncio
+from collections import deque
+from pathlib import Path
+import copy
+import json
+import os
+import time
+from src.models.base_model import ERROR_RESPONSE
+from .evidence_system import DEFAULT_CORE_TRUTH
+
+
+def opening_prompt(core_truth):
+    """Opening narrative prompt, seeded with the hidden truth it must stay consistent with"""
+    events = core_truth["actual_events"]
+    timeline = "\n        ".join(f"- {entry}" for entry in events["timeline"].values())
+    return f"""
+        Present a mysterious series of murders on an isolated island.
+        Include supernatural elements but leave subtle hints toward
+        a logical explanation.
+
+        The hidden truth, which you must never state outright:
+        Culprit: {events['killer']}
+        Motive: {events['motive']}
+        Method: {events['method']}
+        Timeline:
+        {timeline}
+        """
+
+
+def default_core_truth():
+    return copy.deepcopy(DEFAULT_CORE_TRUTH)
+
+
+class MysteryPool:
+    """
+    Warm pool of pre-generated openings, each paired with the core truth
+    it was written for, so a new game starts without waiting on the LLM.
+
+    take() hands out a ready mystery (or None on a miss) and triggers a
+    background refill up to target_size, with at most max_concurrency
+    openings generating at once. The pool is saved to persist_path after
+    every change so it survives restarts. Each mystery is served once.
+    """
+
+    VERSION = 1
+
+    def __init__(self, model, target_size=3, max_concurrency=2, persist_path=None,
+                 core_truth_factory=default_core_truth):
+        """
+        Args:
+            model: BaseModel used to generate openings (action "opening")
+            target_size: Ready mysteries to keep on hand
+            max_concurrency: Most openings generated at the same time
+            persist_path: Optional JSON file the pool is loaded from and saved to
+            core_truth_factory: Returns the core truth for each new mystery
+        """
+        self.model = model
+        self.target_size = target_size
+        self.persist_path = Path(persist_path) if persist_path else None
+        self.core_truth_factory = core_truth_factory
+        self.entries = deque()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tasks = set()
+        self._filled = asyncio.Event()
+        self._stats = {"hits": 0, "misses": 0, "generated": 0, "failures": 0, "generation_seconds": 0.0}
+
+        if self.persist_path and self.persist_path.exists():
+            self.load()
+
+    def start(self):
+        """Begin filling the pool in the background (needs a running event loop)"""
+        self._refill()
+        return self
+
+    def take(self):
+        """Return a ready {"opening", "core_truth", ...} entry, or None if the pool is empty"""
+        if self.entries:
+            entry = self.entries.popleft()
+            self._stats["hits"] += 1
+            self.save()
+        else:
+            entry = None
+            self._stats["misses"] += 1
+        self._refill()
+        return entry
+
+    def _refill(self):
+        missing = self.target_size - len(self.entries) - len(self._tasks)
+        for _ in range(missing):
+            task = asyncio.create_task(self._generate())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        if len(self.entries) >= self.target_size:
+            self._filled.set()
+        else:
+            self._filled.clear()
+
+    async def _generate(self):
+        async with self._semaphore:
+            core_truth = self.core_truth_factory()
+            start = time.perf_counter()
+            try:
+                opening = await self.model.generate_response(opening_prompt(core_truth), action="opening")
+            except Exception as e:
+                print(f"Error pre-generating mystery: {e}")
+                opening = None
+            elapsed = time.perf_counter() - start
+
+        if not opening or not opening.strip() or opening == ERROR_RESPONSE:
+            # Leave the slot empty; the next take() retries
+            self._stats["failures"] += 1
+            return
+        self._stats["generated"] += 1
+        self._stats["generation_seconds"] += elapsed
+        self.entries.append({"opening": opening, "core_truth": core_truth, "created": time.time()})
+        self.save()
+        if len(self.entries) >= self.target_size:
+            self._filled.set()
+
+    async def wait_filled(self, timeout=None):
+        """Wait until target_size mysteries are ready; returns False on timeout"""
+        try:
+            await asyncio.wait_for(self._filled.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def stop(self, timeout=5.0):
+        """
+        Give in-flight generations up to timeout seconds to finish (they are
+        already paid for), cancel the rest, and save what is ready
+        """
+        if self._tasks and timeout:
+            await asyncio.wait(list(self._tasks), timeout=timeout)
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self.save()
+
+    def stats(self):
+        stats = dict(self._stats)
+        takes = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / takes if takes else None
+        stats["size"] = len(self.entries)
+        stats["generating"] = len(self._tasks)
+        stats["mean_generation_seconds"] = (
+            stats["generation_seconds"] / stats["generated"] if stats["generated"] else None
+        )
+        return stats
+
+    def save(self):
+        """Write the ready mysteries to persist_path (atomically)"""
+        if not self.persist_path:
+            return
+        data = {"version": self.VERSION, "entries": list(self.entries)}
+        self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.persist_path.with_suffix(self.persist_path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False))
+        os.replace(tmp_path, self.persist_path)
+
+    def load(self):
+        """Load ready mysteries from persist_path, ignoring unreadable or outdated files"""
+        try:
+            data = json.loads(self.persist_path.read_text())
+        except (OSError, ValueError) as e:
+            print(f"Could not load mystery pool {self.persist_path}: {e}")
+            return
+        if data.get("version") != self.VERSION:
+            return
+        self.entries.extend(data.get("entries", []))
+        print(f"Loaded {len(self.entries)} pre-generated mysteries from {self.persist_path}")
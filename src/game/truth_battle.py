@@ -1,19 +1,48 @@
 # src/game/truth_battle.py
 import time
+from src.game.evidence_system import LOCATIONS
+from src.utils.truth_dedup import NearDuplicateIndex
 
 class TruthBattleSystem:
-    def __init__(self):
+    def __init__(self, merge_duplicates=True, max_aliases=5):
         self.red_truths = {}  # Undeniable facts
         self.blue_theories = {}  # Player theories
+        self.facts_required = 1  # Red truths required to counter a theory
+        # Rewordings of a red truth (same content words) are merged into the first wording seen
+        self.truth_index = NearDuplicateIndex(guard_words=LOCATIONS) if merge_duplicates else None
+        self.max_aliases = max_aliases
     
     def declare_red_truth(self, statement, source="npc"):
+        if self.truth_index is not None:
+            existing_id = self.truth_index.find(statement)
+            if existing_id is not None:
+                return self._merge_red_truth(existing_id, statement)
+        
         truth_id = len(self.red_truths)
         self.red_truths[truth_id] = {
             "statement": statement,
             "timestamp": time.time(),
-            "source": source
+            "source": source,
+            "aliases": [],
+            "mentions": 1
         }
+        if self.truth_index is not None:
+            self.truth_index.add(truth_id, statement)
         return f"「{statement}」"
+    
+    def _merge_red_truth(self, truth_id, statement):
+        """Fold a paraphrase into an existing red truth and return the canonical one"""
+        truth = self.red_truths[truth_id]
+        truth["mentions"] += 1
+        if (statement != truth["statement"]
+                and statement not in truth["aliases"]
+                and len(truth["aliases"]) < self.max_aliases):
+            truth["aliases"].append(statement)
+        return f"「{truth['statement']}」"
+    
+    def format_red_truths(self):
+        """Canonical red truths, one per line, for embedding in prompts"""
+        return "\n".join(f"「{truth['statement']}」" for truth in self.red_truths.values())
 
     def present_blue_theory(self, theory, evidence=None):
         theory_id = len(self.blue_theories)
@@ -1,17 +1,37 @@
 # src/models/audio_model.py
 import asyncio
+import re
+import numpy as np
 import torch
 import sounddevice as sd
 import sys
+import threading
+import time
 from pathlib import Path
 from src.utils.model_downloader import ModelDownloader
+from .audio_scheduler import AudioScheduler, PRIORITY_NORMAL
+from .phoneme_cache import PhonemeCache
+from .quantization import load_quantized_kokoro
+from .voice_registry import VoiceRegistry
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。」])\s+")
 
 class KokoroManager:
-    def __init__(self, voice_name='af'):
+    def __init__(self, voice_name='af', stream_server=None, phoneme_cache_file=None, quantize=False,
+                 voice_memory_budget=32 * 1024 * 1024):
         """
         Initialize Kokoro TTS manager
         Args:
-            voice_name: Voice to use (af, af_bella, af_sarah, etc.)
+            voice_name: Default voice (af, af_bella, af_sarah, etc.); individual
+                utterances can pick another voice, loaded on first use
+            stream_server: Optional AudioStreamServer; when set, speech is streamed
+                to remote clients sentence by sentence instead of played locally
+            phoneme_cache_file: Optional JSON file the phoneme cache is loaded
+                from and saved to, so G2P results survive restarts
+            quantize: Use a dynamically int8-quantized model (CPU only). The
+                quantized model is cached next to the checkpoint after first use.
+            voice_memory_budget: Bytes of voice packs kept loaded before the least
+                recently used ones are evicted (the default voice is never evicted)
         """
         print("Initializing KokoroManager...")
         
@@ -20,7 +40,7 @@ class KokoroManager:
         
         # Now try to import Kokoro modules
         try:
-            from kokoro import generate
+            from kokoro import generate, phonemize
             from models import build_model
             print("Successfully imported Kokoro modules")
         except ImportError as e:
@@ -29,28 +49,36 @@ class KokoroManager:
             raise
         
         self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        if quantize and self.device != 'cpu':
+            print("Quantized mode is CPU only, ignoring CUDA")
+            self.device = 'cpu'
+        self.quantized = quantize
         print(f"Using device: {self.device}")
         
-        # Get model and voice paths
+        # Get model path
         model_path = ModelDownloader.get_model_path()
-        voice_path = ModelDownloader.get_voice_path(voice_name)
         print(f"Model path: {model_path}")
-        print(f"Voice path: {voice_path}")
         
-        # Load model and voice pack
-        self.model = build_model(str(model_path), self.device)
-        self.voice_pack = torch.load(str(voice_path), weights_only=True).to(self.device)
+        # Load model once; voice packs are small and share it
+        if quantize:
+            self.model = load_quantized_kokoro(model_path, build_model)
+        else:
+            self.model = build_model(str(model_path), self.device)
+        self.voices = VoiceRegistry(self.device, memory_budget_bytes=voice_memory_budget)
+        self.voice_pack = self.voices.pin(voice_name)
         self.voice_name = voice_name
+        self.stream_server = stream_server
+        # One synthesis at a time: the model and espeak are not thread-safe
+        self._synthesis_lock = threading.Lock()
         
         # Initialize audio queue and playback
-        self.audio_queue = asyncio.Queue()
-        self.is_playing = False
-        self.queue_processor_active = True
+        self._setup_queue()
         self._setup_audio()
-        self.audio_complete = asyncio.Event()
         
-        # Store generate function
+        # Store generate function; phonemes go through a cache so repeated
+        # names and phrases skip phonemizer/espeak
         self.generate_fn = generate
+        self.phoneme_cache = PhonemeCache(phonemize, persist_path=phoneme_cache_file)
         print("KokoroManager initialization complete!")
 
     def _initialize_kokoro(self):
@@ -82,35 +110,75 @@ class KokoroManager:
                 
         print("Kokoro files verified successfully")
 
+    def _setup_queue(self):
+        """Initialize the speech scheduler and playback state"""
+        self.audio_queue = AudioScheduler()
+        self.is_playing = False
+        self.queue_processor_active = True
+        self.audio_complete = asyncio.Event()
+
     def _setup_audio(self):
         """Initialize audio playback system"""
         self.sample_rate = 24000  # Kokoro outputs 24kHz audio
         sd.default.samplerate = self.sample_rate
         sd.default.channels = 1
 
-    async def generate_speech(self, text, output_file="test.wav"):
-        """Generate speech from text using Kokoro"""
+    async def generate_speech(self, text, output_file="test.wav", voice=None, cancel=None):
+        """
+        Generate speech from text using Kokoro, in voice (default voice if None).
+        Setting the threading.Event cancel stops synthesis at the next sentence.
+        """
+        # Run synthesis off the event loop so streaming clients keep being served
+        work = asyncio.ensure_future(asyncio.to_thread(self._synthesize_text, text, voice, cancel))
         try:
-            audio, phonemes = self.generate_fn(
-                self.model, 
-                text, 
-                self.voice_pack, 
-                lang=self.voice_name[0]
-            )
-            
-            if isinstance(audio, torch.Tensor):
-                audio = audio.cpu().numpy()
-            debug_path = Path(output_file)
-            if output_file:
+            audio = await asyncio.shield(work)
+        except asyncio.CancelledError:
+            # The worker cannot be interrupted mid-sentence: tell it to stop and
+            # wait, so the next utterance never synthesizes alongside it
+            if cancel is not None:
+                cancel.set()
+            await asyncio.gather(work, return_exceptions=True)
+            raise
+        except Exception as e:
+            print(f"Error generating speech: {e}")
+            return None
+
+        try:
+            if output_file and audio is not None:
+                debug_path = Path(output_file)
                 import scipy.io.wavfile
                 scipy.io.wavfile.write(output_file, self.sample_rate, audio)
                 print(f"Saved debug audio to: {debug_path.absolute()}")
-            
-            return audio
-            
         except Exception as e:
-            print(f"Error generating speech: {e}")
-            return None
+            print(f"Error saving debug audio: {e}")
+        return audio
+
+    def _synthesize_text(self, text, voice=None, cancel=None):
+        """Blocking: synthesize text sentence by sentence, stopping early once cancel is set"""
+        pieces = []
+        for sentence in SENTENCE_BOUNDARY.split(text.strip()):
+            if cancel is not None and cancel.is_set():
+                return None
+            if not sentence:
+                continue
+            audio, _ = self._synthesize(sentence, voice)
+            if isinstance(audio, torch.Tensor):
+                audio = audio.cpu().numpy()
+            pieces.append(audio)
+        return np.concatenate(pieces) if pieces else None
+
+    def _synthesize(self, text, voice=None):
+        """Blocking G2P (cached) + acoustic model call; returns (audio, phonemes)"""
+        voice = voice or self.voice_name
+        voice_pack = self.voices.get(voice)
+        # Kokoro voice names start with their language code ('a' US, 'b' UK)
+        lang = voice[0]
+        with self._synthesis_lock:
+            phonemes = self.phoneme_cache.phonemize(text, lang)
+            start = time.perf_counter()
+            result = self.generate_fn(self.model, text, voice_pack, lang=lang, ps=phonemes)
+            self.phoneme_cache.record_acoustic(time.perf_counter() - start)
+        return result
 
     async def play_audio(self, audio_data):
         """Play audio data with sync"""
@@ -156,6 +224,10 @@ class KokoroManager:
                     await asyncio.wait_for(self.audio_complete.wait(), timeout=30.0)
                 except asyncio.TimeoutError:
                     print("Audio playback timed out")
+                except asyncio.CancelledError:
+                    # Barge-in: discard buffered audio instead of letting it drain
+                    stream.abort()
+                    raise
                     
         except Exception as e:
             print(f"Error playing audio: {e}")
@@ -164,32 +236,59 @@ class KokoroManager:
         finally:
             self.is_playing = False
 
-    async def queue_audio(self, text):
-        """Queue text for audio processing"""
+    async def stream_speech(self, text, voice=None, cancel=None):
+        """Synthesize text sentence by sentence, publishing each as soon as it is ready"""
+        for sentence in SENTENCE_BOUNDARY.split(text.strip()):
+            if not sentence:
+                continue
+            audio = await self.generate_speech(sentence, output_file=None, voice=voice, cancel=cancel)
+            if audio is not None:
+                self.stream_server.publish(audio)
+
+    async def queue_audio(self, text, voice=None, priority=PRIORITY_NORMAL):
+        """Queue text for audio processing, optionally in a non-default voice"""
         if self.queue_processor_active:
-            await self.audio_queue.put(text)
-            return True
+            return self.audio_queue.put(text, voice=voice, priority=priority)
         return False
 
+    def barge_in(self):
+        """A new turn started: drop queued speech and cut off whatever is playing"""
+        self.audio_queue.barge_in()
+        if self.stream_server is not None:
+            self.stream_server.flush()
+
+    async def _speak(self, utterance, cancel):
+        print(f"Processing text for audio: {utterance.text[:50]}...")
+        if self.stream_server is not None:
+            await self.stream_speech(utterance.text, voice=utterance.voice, cancel=cancel)
+            return
+        audio_data = await self.generate_speech(utterance.text, voice=utterance.voice, cancel=cancel)
+        if audio_data is not None:
+            await self.play_audio(audio_data)
+
     async def process_audio_queue(self):
-        """Process audio queue with better error handling"""
+        """Speak queued utterances until stopped; sleeps (no polling) while idle"""
         print("Starting audio queue processor...")
         while self.queue_processor_active:
             try:
-                # Use timeout to allow checking queue_processor_active
-                try:
-                    text = await asyncio.wait_for(self.audio_queue.get(), timeout=0.1)
-                except asyncio.TimeoutError:
-                    continue
-                    
-                if text is None:  # Sentinel value for shutdown
+                utterance = await self.audio_queue.get()
+                if utterance is None:  # Closed and drained
                     break
-                    
-                print(f"Processing text for audio: {text[:50]}...")
-                audio_data = await self.generate_speech(text)
-                if audio_data is not None:
-                    await self.play_audio(audio_data)
-                
+
+                # Speak in a child task so barge_in() can cancel just this utterance;
+                # cancel also stops its synthesis thread at the next sentence
+                cancel = threading.Event()
+                task = asyncio.create_task(self._speak(utterance, cancel))
+                self.audio_queue.started(task, cancel)
+                try:
+                    await asyncio.wait({task})
+                except asyncio.CancelledError:
+                    task.cancel()
+                    raise
+                self.audio_queue.finished(task)
+                if not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+
             except asyncio.CancelledError:
                 print("Audio queue processor was cancelled")
                 break
@@ -206,21 +305,18 @@ class KokoroManager:
         print("Stopping audio manager...")
         self.queue_processor_active = False
         
-        # Clear the queue
-        while not self.audio_queue.empty():
-            try:
-                self.audio_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
-        
-        # Add sentinel value to ensure the processor exits
-        await self.audio_queue.put(None)
+        # Drop queued speech, interrupt the current utterance and wake the processor
+        self.audio_queue.close(drain=False)
         
         # Stop any playing audio
         if self.is_playing:
             sd.stop()
             self.is_playing = False
             self.audio_complete.set()
+        
+        # Keep learned phonemes for the next session
+        if self.phoneme_cache is not None:
+            self.phoneme_cache.save()
 
 def print_directory_contents(path, indent=""):
     """Helper function to print directory contents recursively"""
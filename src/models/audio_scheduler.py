@@ -0,0 +1,167 @@
+# src/models/audio_scheduler.py
+import asyncio
+import heapq
+import itertools
+import time
+
+# Lower plays first; equal priorities play in the order they were queued
+PRIORITY_URGENT = 0
+PRIORITY_NORMAL = 10
+PRIORITY_BACKGROUND = 20
+
+
+class Utterance:
+    """One queued piece of speech"""
+
+    __slots__ = ("priority", "seq", "text", "voice", "enqueued")
+
+    def __init__(self, priority, seq, text, voice):
+        self.priority = priority
+        self.seq = seq
+        self.text = text
+        self.voice = voice
+        self.enqueued = time.perf_counter()
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class AudioScheduler:
+    """
+    Event-driven priority queue of utterances with barge-in.
+
+    The consumer sleeps on an asyncio.Event that is only set by put(),
+    barge_in() and close(), so an idle session costs no wakeups at all.
+    barge_in() drops everything still queued and cancels the utterance in
+    progress (synthesis or playback), so a new turn never waits behind
+    stale speech. close() lets the queue drain, then get() returns None.
+
+    Cancellation latency runs from the interrupt to the moment the
+    speaking task has finished. KokoroManager only lets that task finish
+    once playback is aborted and its synthesis thread has returned, so
+    this is when speech (and the work behind it) has actually stopped.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._seq = itertools.count()
+        self._ready = asyncio.Event()
+        self._closed = False
+        self._current = None
+        self._current_cancel = None
+        self._cancel_requested = None
+        self._stats = {
+            "queued": 0,
+            "completed": 0,
+            "dropped": 0,
+            "interrupted": 0,
+            "barge_ins": 0,
+            "wakeups": 0,
+            "idle_wakeups": 0,
+            "queue_wait_seconds": 0.0,
+            "cancel_latency_seconds": 0.0,
+            "max_cancel_latency_seconds": 0.0,
+        }
+
+    def put(self, text, voice=None, priority=PRIORITY_NORMAL):
+        """Queue text for speech; returns False once the scheduler is closed"""
+        if self._closed:
+            return False
+        heapq.heappush(self._heap, Utterance(priority, next(self._seq), text, voice))
+        self._stats["queued"] += 1
+        self._ready.set()
+        return True
+
+    async def get(self):
+        """Wait for the next utterance by priority, or None once closed and drained"""
+        while True:
+            if self._heap:
+                utterance = heapq.heappop(self._heap)
+                self._stats["queue_wait_seconds"] += time.perf_counter() - utterance.enqueued
+                return utterance
+            if self._closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+            self._stats["wakeups"] += 1
+            if not self._heap and not self._closed:
+                # e.g. a barge-in that found nothing queued
+                self._stats["idle_wakeups"] += 1
+
+    def started(self, task, cancel=None):
+        """
+        Register the task speaking the current utterance, so it can be
+        interrupted. cancel (e.g. a threading.Event) is set on interrupt too,
+        for work the task hands to threads.
+        """
+        self._current = task
+        self._current_cancel = cancel
+
+    def finished(self, task):
+        """Record how the current utterance ended once its task is done"""
+        if task is not self._current:
+            return
+        self._current = None
+        self._current_cancel = None
+        if not task.cancelled():
+            self._stats["completed"] += 1
+            return
+        self._stats["interrupted"] += 1
+        if self._cancel_requested is not None:
+            latency = time.perf_counter() - self._cancel_requested
+            self._cancel_requested = None
+            self._stats["cancel_latency_seconds"] += latency
+            self._stats["max_cancel_latency_seconds"] = max(
+                self._stats["max_cancel_latency_seconds"], latency
+            )
+
+    def barge_in(self):
+        """Drop queued speech and interrupt the utterance in progress"""
+        self._stats["barge_ins"] += 1
+        self.clear()
+        self._interrupt()
+
+    def clear(self):
+        """Drop every queued utterance; returns how many were dropped"""
+        dropped = len(self._heap)
+        self._heap.clear()
+        self._stats["dropped"] += dropped
+        return dropped
+
+    def close(self, drain=True):
+        """Stop accepting speech; without drain, also drop and interrupt what is left"""
+        self._closed = True
+        if not drain:
+            self.clear()
+            self._interrupt()
+        self._ready.set()
+
+    def _interrupt(self):
+        if self._current is not None and not self._current.done():
+            if self._cancel_requested is None:
+                self._cancel_requested = time.perf_counter()
+            if self._current_cancel is not None:
+                self._current_cancel.set()
+            self._current.cancel()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def qsize(self):
+        return len(self._heap)
+
+    def empty(self):
+        return not self._heap
+
+    def stats(self):
+        stats = dict(self._stats)
+        served = stats["completed"] + stats["interrupted"]
+        stats["depth"] = len(self._heap)
+        stats["speaking"] = self._current is not None
+        stats["mean_queue_wait_seconds"] = stats.pop("queue_wait_seconds") / served if served else None
+        total_latency = stats.pop("cancel_latency_seconds")
+        stats["mean_cancel_latency_seconds"] = (
+            total_latency / stats["interrupted"] if stats["interrupted"] else None
+        )
+        return stats
@@ -0,0 +1,279 @@
+# src/models/audio_stream.py
+"""
+Streams synthesized speech to remote clients as chunked HTTP.
+
+    GET /stream?rate=12000  ->  Transfer-Encoding: chunked, audio/L16 (PCM16 LE, mono)
+
+Each utterance is converted to PCM16 once per requested sample rate and
+the resulting buffer is shared, sliced with memoryviews, by every client
+at that rate. Every client has its own bounded queue; when a client falls
+behind, its oldest frames are dropped so it never stalls synthesis or the
+other listeners.
+"""
+import asyncio
+from urllib.parse import parse_qs, urlsplit
+import numpy as np
+
+SOURCE_SAMPLE_RATE = 24000  # Kokoro outputs 24kHz audio
+
+
+def to_pcm16(audio, sample_rate=SOURCE_SAMPLE_RATE, target_rate=None):
+    """
+    Convert float audio in [-1, 1] to little-endian PCM16, optionally
+    downsampling by an integer factor (24000 -> 12000, 8000, ...).
+    """
+    audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+    if target_rate and target_rate != sample_rate:
+        if sample_rate % target_rate:
+            raise ValueError(f"Cannot downsample {sample_rate}Hz to {target_rate}Hz by an integer factor")
+        factor = sample_rate // target_rate
+        usable = len(audio) - len(audio) % factor
+        # Box filter then decimate; cheap and good enough for speech
+        audio = audio[:usable].reshape(-1, factor).mean(axis=1)
+    pcm = np.empty(len(audio), dtype="<i2")
+    np.multiply(np.clip(audio, -1.0, 1.0), 32767, out=pcm, casting="unsafe")
+    return pcm
+
+
+class _StreamClient:
+    """One connected listener with its own bounded frame queue"""
+
+    def __init__(self, writer, rate, max_buffered_frames):
+        self.writer = writer
+        self.rate = rate
+        self.queue = asyncio.Queue(maxsize=max_buffered_frames)
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.frames_flushed = 0
+        self.task = asyncio.current_task()
+
+    def offer(self, frame):
+        """Queue a frame, dropping the oldest one if the client is behind"""
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+                self.frames_dropped += 1
+            except asyncio.QueueEmpty:
+                pass
+        self.queue.put_nowait(frame)
+
+    def flush(self):
+        """Drop every queued frame, keeping an end-of-stream marker if one is queued"""
+        ending = False
+        while not self.queue.empty():
+            frame = self.queue.get_nowait()
+            if frame is None:
+                ending = True
+            else:
+                self.frames_flushed += 1
+        if ending:
+            self.queue.put_nowait(None)
+
+
+class AudioStreamServer:
+    """Chunked-HTTP PCM16 broadcaster for KokoroManager output"""
+
+    def __init__(self, host="127.0.0.1", port=8765, sample_rate=SOURCE_SAMPLE_RATE,
+                 frame_ms=100, max_buffered_seconds=20.0):
+        """
+        Args:
+            sample_rate: Rate of the audio passed to publish()
+            frame_ms: Size of each HTTP chunk in milliseconds of audio
+            max_buffered_seconds: Audio a client may fall behind by before its
+                oldest frames are dropped
+        """
+        self.host = host
+        self.port = port
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.max_buffered_frames = max(1, int(max_buffered_seconds * 1000 / frame_ms))
+        self.clients = set()
+        self._server = None
+        # Totals from clients that have already disconnected
+        self._closed_frames_sent = 0
+        self._closed_frames_dropped = 0
+        self._closed_frames_flushed = 0
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        print(f"Audio stream listening on http://{self.host}:{self.port}/stream")
+        return self
+
+    async def stop(self, timeout=1.0):
+        """End all client streams and stop listening"""
+        clients = list(self.clients)
+        for client in clients:
+            client.offer(None)
+        # Give healthy clients time to flush; cut off the ones stuck on a full socket
+        tasks = [client.task for client in clients if client.task is not None]
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+        stuck = [client for client in clients if client in self.clients]
+        for client in stuck:
+            client.writer.transport.abort()
+        if stuck:
+            await asyncio.wait([client.task for client in stuck], timeout=timeout)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def publish(self, audio):
+        """
+        Send an utterance (or part of one) to every connected client.
+        Never blocks: slow clients lose their oldest frames instead.
+        """
+        if not self.clients or audio is None:
+            return
+        pcm_by_rate = {}
+        for client in list(self.clients):
+            if client.rate not in pcm_by_rate:
+                pcm = to_pcm16(audio, self.sample_rate, client.rate)
+                pcm_by_rate[client.rate] = self._frames(memoryview(pcm).cast("B"), client.rate)
+            for frame in pcm_by_rate[client.rate]:
+                client.offer(frame)
+
+    def flush(self):
+        """
+        Drop the audio every client has queued but not yet been sent, e.g.
+        when a new turn barges in. Frames already written to a socket still
+        play out on the client.
+        """
+        for client in list(self.clients):
+            client.flush()
+
+    def _frames(self, data, rate):
+        """Zero-copy slices of data, frame_ms of audio each"""
+        frame_bytes = max(2, rate * self.frame_ms // 1000 * 2)
+        return [data[i:i + frame_bytes] for i in range(0, len(data), frame_bytes)]
+
+    def stats(self):
+        return {
+            "clients": len(self.clients),
+            "frames_sent": self._closed_frames_sent + sum(c.frames_sent for c in self.clients),
+            "frames_dropped": self._closed_frames_dropped + sum(c.frames_dropped for c in self.clients),
+            "frames_flushed": self._closed_frames_flushed + sum(c.frames_flushed for c in self.clients),
+            "max_buffered_frames": max((c.queue.qsize() for c in self.clients), default=0),
+        }
+
+    async def _handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode("latin-1")
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            method, target, _ = (request_line.split(" ", 2) + ["", ""])[:3]
+            url = urlsplit(target)
+            rate = int(parse_qs(url.query).get("rate", [self.sample_rate])[0])
+
+            if method != "GET" or url.path != "/stream":
+                await self._reply_error(writer, "404 Not Found", "Use GET /stream")
+                return
+            if rate <= 0 or rate > self.sample_rate or self.sample_rate % rate:
+                await self._reply_error(
+                    writer, "400 Bad Request",
+                    f"rate must divide {self.sample_rate} evenly"
+                )
+                return
+        except (ValueError, ConnectionError):
+            writer.close()
+            return
+
+        writer.write(
+            "HTTP/1.1 200 OK\r\n"
+            f"Content-Type: audio/L16; rate={rate}; channels=1\r\n"
+            "Transfer-Encoding: chunked\r\n"
+            "Cache-Control: no-store\r\n"
+            "\r\n".encode()
+        )
+        client = _StreamClient(writer, rate, self.max_buffered_frames)
+        self.clients.add(client)
+        try:
+            await writer.drain()
+            while True:
+                frame = await client.queue.get()
+                if writer.is_closing():
+                    break
+                if frame is None:
+                    writer.write(b"0\r\n\r\n")
+                    await writer.drain()
+                    break
+                writer.writelines([f"{len(frame):x}\r\n".encode(), frame, b"\r\n"])
+                # Waiting here is the per-client backpressure: only this
+                # client's queue fills up while its socket is slow.
+                await writer.drain()
+                client.frames_sent += 1
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.clients.discard(client)
+            self._closed_frames_sent += client.frames_sent
+            self._closed_frames_dropped += client.frames_dropped
+            self._closed_frames_flushed += client.frames_flushed
+            writer.close()
+
+    async def _reply_error(self, writer, status, message):
+        body = message.encode()
+        writer.write(
+            f"HTTP/1.1 {status}\r\n"
+            "Content-Type: text/plain\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n"
+            "\r\n".encode() + body
+        )
+        await writer.drain()
+        writer.close()
+
+
+async def stream_audio(host="127.0.0.1", port=8765, rate=None):
+    """Minimal client: yield PCM16 chunks from an AudioStreamServer"""
+    reader, writer = await asyncio.open_connection(host, port)
+    query = f"?rate={rate}" if rate else ""
+    writer.write(f"GET /stream{query} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+    await writer.drain()
+    try:
+        status = (await reader.readline()).decode("latin-1")
+        if " 200 " not in status:
+            raise ConnectionError(f"Stream refused: {status.strip()}")
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        while True:
+            size = int((await reader.readline()).strip() or b"0", 16)
+            if size == 0:
+                break
+            chunk = await reader.readexactly(size)
+            await reader.readexactly(2)  # chunk terminator
+            yield chunk
+    finally:
+        writer.close()
+
+
+async def _record(host, port, rate, output_file, seconds):
+    import scipy.io.wavfile
+
+    received = bytearray()
+
+    async def collect():
+        async for chunk in stream_audio(host, port, rate):
+            received.extend(chunk)
+
+    try:
+        await asyncio.wait_for(collect(), timeout=seconds)
+    except asyncio.TimeoutError:
+        pass
+    audio = np.frombuffer(bytes(received), dtype="<i2")
+    scipy.io.wavfile.write(output_file, rate or SOURCE_SAMPLE_RATE, audio)
+    print(f"Received {len(audio) / (rate or SOURCE_SAMPLE_RATE):.1f}s of audio into {output_file}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Record a remote audio stream to a WAV file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate", type=int, help="Requested sample rate (must divide 24000)")
+    parser.add_argument("--seconds", type=float, default=30.0, help="Stop recording after this long")
+    parser.add_argument("--output", default="stream.wav")
+    args = parser.parse_args()
+    asyncio.run(_record(args.host, args.port, args.rate, args.output, args.seconds))
@@ -1,24 +1,63 @@
 # src/models/base_model.py
 from transformers import AutoModelForCausalLM, AutoTokenizer
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
 import os
+import time
+from .model_router import ModelRouter
+
+ERROR_RESPONSE = "Sorry, there was an error generating the response."
 
 class BaseModel:
-    def __init__(self):
-        # Initialize Anthropic client with your API key
-        self.client = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
-        
-    async def generate_response(self, prompt):
+    def __init__(self, routes=None):
+        # Initialize Anthropic client with your API key. The async client keeps
+        # concurrent game sessions from blocking each other on the event loop.
+        self.client = AsyncAnthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+        # Picks model/max_tokens/temperature per action type
+        self.router = ModelRouter(routes)
+
+    async def generate_response(self, prompt, action="default", validate=None):
+        """
+        Generate a response using the route configured for action.
+        Args:
+            prompt: User prompt to send
+            action: Action type used to pick the route (see model_router.DEFAULT_ROUTES)
+            validate: Optional callable(response) -> bool. If it rejects the answer
+                and the route has an escalate_to route, the prompt is retried there.
+        """
+        route_name, route = self.router.route(action)
+        response = await self._call_route(route_name, route, prompt)
+
+        if validate is not None and route.get("escalate_to") and not validate(response):
+            self.router.record_escalation(route_name)
+            route_name, route = self.router.route(route["escalate_to"])
+            response = await self._call_route(route_name, route, prompt)
+        return response
+
+    async def close(self):
+        """Close the HTTP client's pooled connections"""
+        await self.client.close()
+
+    async def _call_route(self, route_name, route, prompt):
+        start = time.perf_counter()
         try:
-            message = self.client.messages.create(
-                model="claude-3-5-sonnet-latest",  # or use other Claude models
-                max_tokens=1000,
-                temperature=0.7,
+            message = await self.client.messages.create(
+                model=route["model"],
+                max_tokens=route.get("max_tokens", 1000),
+                temperature=route.get("temperature", 0.7),
                 messages=[
                     {"role": "user", "content": prompt}
                 ]
             )
+            usage = getattr(message, "usage", None)
+            self.router.record(
+                route_name,
+                route["model"],
+                time.perf_counter() - start,
+                getattr(usage, "input_tokens", 0),
+                getattr(usage, "output_tokens", 0)
+            )
             return message.content[0].text
         except Exception as e:
+            self.router.record_error(route_name)
             print(f"Error generating response: {e}")
-            return "Sorry, there was an error generating the response."
\ No newline at end of file
+            return ERROR_RESPONSE
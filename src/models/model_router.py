@@ -0,0 +1,121 @@
+# src/models/model_router.py
+from collections import deque
+import copy
+import json
+import os
+
+# USD per million tokens: (input, output)
+MODEL_PRICING = {
+    "claude-3-5-sonnet-latest": (3.00, 15.00),
+    "claude-3-5-haiku-latest": (0.80, 4.00),
+    "claude-3-opus-latest": (15.00, 75.00),
+}
+
+# Each action type maps to a route. "escalate_to" names the route to retry
+# on when the caller's local validity check rejects this route's answer.
+DEFAULT_ROUTES = {
+    "default": {"model": "claude-3-5-sonnet-latest", "max_tokens": 1000, "temperature": 0.7},
+    "opening": {"model": "claude-3-5-sonnet-latest", "max_tokens": 1000, "temperature": 0.9},
+    "question": {
+        "model": "claude-3-5-haiku-latest", "max_tokens": 400, "temperature": 0.7,
+        "escalate_to": "default",
+    },
+    "theory_challenge": {
+        "model": "claude-3-5-haiku-latest", "max_tokens": 600, "temperature": 0.5,
+        "escalate_to": "default",
+    },
+    "theory_validation": {"model": "claude-3-5-haiku-latest", "max_tokens": 300, "temperature": 0.0},
+}
+
+
+class ModelRouter:
+    """
+    Picks model, max_tokens and temperature per action type and keeps
+    per-route latency, token and cost statistics.
+
+    Routes can be overridden with a dict or a JSON file (MODEL_ROUTES_FILE),
+    e.g. {"question": {"model": "claude-3-5-sonnet-latest"}}. Overrides are
+    merged into the defaults route by route.
+    """
+
+    def __init__(self, routes=None, routes_file=None, latency_window=1000):
+        self.routes = copy.deepcopy(DEFAULT_ROUTES)
+        routes_file = routes_file or os.getenv("MODEL_ROUTES_FILE")
+        if routes_file:
+            with open(routes_file) as f:
+                self._merge(json.load(f))
+        if routes:
+            self._merge(routes)
+
+        self.latency_window = latency_window
+        self._stats = {}
+
+    def _merge(self, overrides):
+        for name, route in overrides.items():
+            self.routes.setdefault(name, {}).update(route)
+        for name, route in self.routes.items():
+            if "model" not in route:
+                raise ValueError(f"Route '{name}' has no model")
+            target = route.get("escalate_to")
+            if target is not None and target not in self.routes:
+                raise ValueError(f"Route '{name}' escalates to unknown route '{target}'")
+
+    def route(self, action):
+        """Return (route_name, route) for an action, falling back to default"""
+        name = action if action in self.routes else "default"
+        return name, self.routes[name]
+
+    def _route_stats(self, name):
+        if name not in self._stats:
+            self._stats[name] = {
+                "calls": 0,
+                "errors": 0,
+                "escalations": 0,
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "cost_usd": 0.0,
+                "latency_total_s": 0.0,
+                "latencies": deque(maxlen=self.latency_window),
+            }
+        return self._stats[name]
+
+    def record(self, name, model, latency, input_tokens=0, output_tokens=0):
+        """Record a successful call made on route name"""
+        stats = self._route_stats(name)
+        stats["calls"] += 1
+        stats["input_tokens"] += input_tokens
+        stats["output_tokens"] += output_tokens
+        stats["cost_usd"] += self.cost(model, input_tokens, output_tokens)
+        stats["latency_total_s"] += latency
+        stats["latencies"].append(latency)
+
+    def record_error(self, name):
+        self._route_stats(name)["errors"] += 1
+
+    def record_escalation(self, name):
+        """Count an answer from route name that failed validation"""
+        self._route_stats(name)["escalations"] += 1
+
+    @staticmethod
+    def cost(model, input_tokens, output_tokens):
+        """Estimated USD cost of a call; unknown models are priced at zero"""
+        input_price, output_price = MODEL_PRICING.get(model, (0.0, 0.0))
+        return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+    def stats(self):
+        """Per-route summary suitable for logging or JSON reports"""
+        summary = {}
+        for name, stats in self._stats.items():
+            latencies = sorted(stats["latencies"])
+            summary[name] = {
+                "model": self.routes.get(name, {}).get("model"),
+                "calls": stats["calls"],
+                "errors": stats["errors"],
+                "escalations": stats["escalations"],
+                "input_tokens": stats["input_tokens"],
+                "output_tokens": stats["output_tokens"],
+                "cost_usd": stats["cost_usd"],
+                "mean_latency_s": stats["latency_total_s"] / stats["calls"] if stats["calls"] else None,
+                "p95_latency_s": latencies[int(0.95 * (len(latencies) - 1))] if latencies else None,
+            }
+        return summary
@@ -0,0 +1,207 @@
+# src/models/phoneme_cache.py
+from collections import OrderedDict
+from pathlib import Path
+import json
+import os
+import threading
+import time
+
+# English words whose pronunciation depends on meaning or context; never
+# composed from the word cache. Others are found as espeak disagrees with
+# itself (e.g. "the" before a vowel).
+HOMOGRAPHS = {
+    "lead", "read", "wind", "close", "live", "tear", "wound", "bow", "row",
+    "minute", "object", "present", "record", "use", "used", "desert",
+    "does", "dove", "content", "refuse", "lives", "bass", "polish", "moped",
+}
+ENGLISH_LANGS = ("a", "b")
+
+
+class PhonemeCache:
+    """
+    Sentence- and word-level G2P cache in front of Kokoro's phonemize().
+
+    Sentences already seen are served from the sentence cache. A new
+    sentence made only of words seen before is composed from the word
+    cache. Anything else goes through phonemizer/espeak, and when espeak's
+    output lines up word for word with the input, its words are cached too.
+    A word espeak has pronounced two different ways (a homograph, or a
+    context-dependent form like "the") is marked ambiguous, and sentences
+    containing it always go through espeak. Both caches are LRU-bounded
+    and can be persisted to a JSON file.
+    """
+
+    VERSION = 2
+
+    def __init__(self, phonemize_fn, max_sentences=2048, max_words=20000,
+                 persist_path=None, word_level=True):
+        """
+        Args:
+            phonemize_fn: Callable(text, lang) -> phoneme string (kokoro.phonemize)
+            max_sentences: Sentence entries kept before LRU eviction
+            max_words: Word entries kept before LRU eviction
+            persist_path: Optional JSON file to load from and save() to
+            word_level: Compose unseen sentences from cached words
+        """
+        self.phonemize_fn = phonemize_fn
+        self.max_sentences = max_sentences
+        self.max_words = max_words
+        self.persist_path = Path(persist_path) if persist_path else None
+        self.word_level = word_level
+
+        self.sentences = OrderedDict()
+        self.words = OrderedDict()
+        self.ambiguous = set()
+        self._lock = threading.Lock()
+        self._stats = {
+            "sentence_hits": 0,
+            "word_composed": 0,
+            "compose_blocked": 0,
+            "misses": 0,
+            "g2p_seconds": 0.0,
+            "g2p_chars": 0,
+            "cached_chars": 0,
+            "acoustic_seconds": 0.0,
+            "acoustic_calls": 0,
+        }
+
+        if self.persist_path and self.persist_path.exists():
+            self.load()
+
+    def phonemize(self, text, lang):
+        """Return phonemes for text, running G2P only when nothing cached covers it"""
+        key = (lang, text)
+        with self._lock:
+            ps = self._get(self.sentences, key)
+            if ps is not None:
+                self._stats["sentence_hits"] += 1
+                self._stats["cached_chars"] += len(text)
+                return ps
+
+            if self.word_level:
+                ps = self._compose(text, lang)
+                if ps is not None:
+                    self._stats["word_composed"] += 1
+                    self._stats["cached_chars"] += len(text)
+                    self._put(self.sentences, key, ps, self.max_sentences)
+                    return ps
+
+        start = time.perf_counter()
+        ps = self.phonemize_fn(text, lang)
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self._stats["misses"] += 1
+            self._stats["g2p_seconds"] += elapsed
+            self._stats["g2p_chars"] += len(text)
+            self._put(self.sentences, key, ps, self.max_sentences)
+            if self.word_level:
+                self._learn_words(text, ps, lang)
+        return ps
+
+    def record_acoustic(self, seconds):
+        """Record time spent in the acoustic model for the timing breakdown"""
+        with self._lock:
+            self._stats["acoustic_seconds"] += seconds
+            self._stats["acoustic_calls"] += 1
+
+    def _compose(self, text, lang):
+        pieces = []
+        for word in text.split():
+            key = (lang, word)
+            if self._is_ambiguous(key):
+                self._stats["compose_blocked"] += 1
+                return None
+            ps = self._get(self.words, key)
+            if ps is None:
+                return None
+            pieces.append(ps)
+        return " ".join(pieces) if pieces else None
+
+    def _is_ambiguous(self, key):
+        lang, word = key
+        if key in self.ambiguous:
+            return True
+        return lang in ENGLISH_LANGS and word.lower().strip(".,!?;:\"'") in HOMOGRAPHS
+
+    def _learn_words(self, text, ps, lang):
+        words = text.split()
+        pieces = ps.split()
+        # Only trust a one-to-one alignment; number expansion or espeak
+        # joining function words ("of the") changes the count.
+        if len(words) != len(pieces):
+            return
+        for word, piece in zip(words, pieces):
+            key = (lang, word)
+            if self._is_ambiguous(key):
+                continue
+            known = self.words.get(key)
+            if known is not None and known != piece:
+                # Pronounced differently in another sentence: never compose it
+                self.ambiguous.add(key)
+                del self.words[key]
+                continue
+            self._put(self.words, key, piece, self.max_words)
+
+    @staticmethod
+    def _get(cache, key):
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+    @staticmethod
+    def _put(cache, key, value, limit):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > limit:
+            cache.popitem(last=False)
+
+    def stats(self):
+        """Hit counts and the G2P vs acoustic-model time breakdown"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["sentences_cached"] = len(self.sentences)
+            stats["words_cached"] = len(self.words)
+            stats["ambiguous_words"] = len(self.ambiguous)
+        lookups = stats["sentence_hits"] + stats["word_composed"] + stats["misses"]
+        stats["hit_rate"] = (lookups - stats["misses"]) / lookups if lookups else None
+        # Estimate what the hits would have cost at the observed G2P speed
+        per_char = stats["g2p_seconds"] / stats["g2p_chars"] if stats["g2p_chars"] else 0.0
+        stats["g2p_seconds_saved"] = per_char * stats["cached_chars"]
+        synth_total = stats["g2p_seconds"] + stats["acoustic_seconds"]
+        stats["g2p_share"] = stats["g2p_seconds"] / synth_total if synth_total else None
+        return stats
+
+    def save(self):
+        """Write both caches to persist_path (atomically)"""
+        if not self.persist_path:
+            return
+        with self._lock:
+            data = {
+                "version": self.VERSION,
+                "sentences": [[lang, text, ps] for (lang, text), ps in self.sentences.items()],
+                "words": [[lang, word, ps] for (lang, word), ps in self.words.items()],
+                "ambiguous": [[lang, word] for lang, word in self.ambiguous],
+            }
+        self.persist_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.persist_path.with_suffix(self.persist_path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False))
+        os.replace(tmp_path, self.persist_path)
+
+    def load(self):
+        """Load caches from persist_path, ignoring unreadable or outdated files"""
+        try:
+            data = json.loads(self.persist_path.read_text())
+        except (OSError, ValueError) as e:
+            print(f"Could not load phoneme cache {self.persist_path}: {e}")
+            return
+        if data.get("version") != self.VERSION:
+            return
+        with self._lock:
+            for lang, text, ps in data.get("sentences", []):
+                self._put(self.sentences, (lang, text), ps, self.max_sentences)
+            for lang, word, ps in data.get("words", []):
+                self._put(self.words, (lang, word), ps, self.max_words)
+            self.ambiguous.update((lang, word) for lang, word in data.get("ambiguous", []))
+        print(f"Loaded {len(self.sentences)} sentences and {len(self.words)} words from phoneme cache")
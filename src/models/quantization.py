@@ -0,0 +1,82 @@
+# src/models/quantization.py
+import hashlib
+import io
+import os
+from pathlib import Path
+import torch
+import torch.nn as nn
+
+# Layers replaced by dynamically quantized int8 versions
+QUANTIZED_LAYER_TYPES = {nn.Linear, nn.LSTM, nn.GRU}
+QUANTIZED_RNN_TYPES = (torch.ao.nn.quantized.dynamic.LSTM, torch.ao.nn.quantized.dynamic.GRU)
+
+
+def _flatten_parameters_noop():
+    """Quantized RNNs have no flatten_parameters(); Kokoro calls it before every LSTM"""
+
+
+def _patch_quantized_rnns(module):
+    for child in module.modules():
+        if isinstance(child, QUANTIZED_RNN_TYPES) and not hasattr(child, "flatten_parameters"):
+            child.flatten_parameters = _flatten_parameters_noop
+
+
+def quantize_kokoro(model):
+    """
+    Apply dynamic int8 quantization to every sub-model of a Kokoro model
+    (the Munch returned by build_model). CPU only.
+    """
+    for key in list(model.keys()):
+        module = model[key].to("cpu").eval()
+        model[key] = torch.ao.quantization.quantize_dynamic(
+            module, QUANTIZED_LAYER_TYPES, dtype=torch.qint8
+        )
+        _patch_quantized_rnns(model[key])
+    return model
+
+
+def quantized_artifact_path(model_path):
+    """
+    Cache location for the quantized model. The name encodes the source
+    checkpoint's size/mtime and the torch version, so a new checkpoint or
+    torch upgrade produces a fresh artifact instead of loading a stale one.
+    """
+    model_path = Path(model_path)
+    stat = model_path.stat()
+    fingerprint = hashlib.sha1(
+        f"{stat.st_size}:{stat.st_mtime_ns}:{torch.__version__}".encode()
+    ).hexdigest()[:12]
+    return model_path.with_name(f"{model_path.stem}.int8-{fingerprint}.pt")
+
+
+def load_quantized_kokoro(model_path, build_model):
+    """
+    Return an int8 Kokoro model, loading the cached artifact when present and
+    otherwise building the fp32 model, quantizing it and caching the result.
+    """
+    artifact = quantized_artifact_path(model_path)
+    if artifact.exists():
+        try:
+            # Our own artifact: it holds pickled modules, not just tensors
+            model = torch.load(str(artifact), map_location="cpu", weights_only=False)
+            for module in model.values():
+                _patch_quantized_rnns(module)
+            print(f"Loaded quantized model from {artifact}")
+            return model
+        except Exception as e:
+            print(f"Could not load quantized model {artifact}, re-quantizing: {e}")
+
+    print("Quantizing Kokoro model to int8 (first run only)...")
+    model = quantize_kokoro(build_model(str(model_path), "cpu"))
+    tmp_path = artifact.with_suffix(".tmp")
+    torch.save(model, str(tmp_path))
+    os.replace(tmp_path, artifact)
+    print(f"Saved quantized model to {artifact}")
+    return model
+
+
+def model_size_bytes(model):
+    """Serialized size of all weights, including packed int8 weights"""
+    buffer = io.BytesIO()
+    torch.save({key: module.state_dict() for key, module in model.items()}, buffer)
+    return buffer.tell()
@@ -2,10 +2,10 @@
 from .base_model import BaseModel
 
 class TruthModel(BaseModel):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, routes=None):
+        super().__init__(routes=routes)
         
-    async def generate_with_truth_constraints(self, prompt, red_truths, required_truth_count=1):
+    async def generate_with_truth_constraints(self, prompt, red_truths, required_truth_count=1, action="default"):
         # Enhance prompt with truth requirements
         enhanced_prompt = f"""
         You must maintain consistency with these established facts:
@@ -17,7 +17,7 @@ class TruthModel(BaseModel):
         {prompt}
         """
         
-        response = await self.generate_response(enhanced_prompt)
+        response = await self.generate_response(enhanced_prompt, action=action)
         return response
     
     def _format_red_truths(self, red_truths):
@@ -33,6 +33,7 @@ class TruthModel(BaseModel):
         2. Is logically possible
         3. Has sufficient evidence
         
-        Respond with specific contradictions if found.
+        Start your answer with a single line containing only VALID or CONTRADICTS.
+        Then respond with specific contradictions if found.
         """
-        return await self.generate_response(validation_prompt)
\ No newline at end of file
+        return await self.generate_response(validation_prompt, action="theory_validation")
\ No newline at end of file
@@ -0,0 +1,489 @@
+# src/models/tts_daemon.py
+"""
+Long-lived local TTS service on a Unix socket.
+
+One daemon process owns the Kokoro model, voice registry and phoneme
+cache; game processes connect with TTSClient (or RemoteKokoroManager)
+instead of loading their own copy.
+
+Protocol: newline-delimited JSON headers, optionally followed by a
+binary payload of the announced size (PCM16 LE, mono, 24kHz).
+
+    -> {"op": "synthesize", "id": 7, "text": "...", "voice": "af"}
+    <- {"id": 7, "seq": 0, "bytes": 48000}   + 48000 bytes
+    <- {"id": 7, "seq": 1, "bytes": 30720}   + 30720 bytes
+    <- {"id": 7, "done": true}
+    -> {"op": "cancel", "id": 7}
+    -> {"op": "stats", "id": 8}
+    <- {"id": 8, "stats": {...}}
+
+Failures are reported as {"id": ..., "error": "..."}. cancel has no
+reply: the request's remaining sentences are dropped from the queue and
+nothing more is sent for it (a sentence already being synthesized
+finishes, but is not sent).
+
+Batching: Kokoro runs one utterance per forward pass, so requests cannot
+be padded into one tensor batch. Instead, sentences that arrive within
+batch_window_ms of each other are collected (up to max_batch), identical
+(voice, text) pairs are synthesized once, and the batch is ordered by
+voice and run back to back in a single worker-thread hop. Each sentence
+is handed back the moment it is synthesized, so batching never holds a
+finished sentence until the rest of the batch is done. Each request keeps at most
+one sentence queued, so a long monologue from one session cannot starve
+short replies from the others, and audio streams back sentence by
+sentence as it is ready.
+"""
+import asyncio
+from collections import Counter
+import json
+import os
+from pathlib import Path
+import tempfile
+import time
+import numpy as np
+import torch
+from .audio_model import KokoroManager, SENTENCE_BOUNDARY
+from .audio_stream import to_pcm16
+
+DEFAULT_SOCKET_PATH = os.getenv(
+    "TTS_SOCKET_PATH",
+    str(Path(tempfile.gettempdir()) / f"kokoro-tts-{os.getuid()}.sock"),
+)
+
+
+class _Job:
+    """One sentence waiting to be synthesized"""
+
+    __slots__ = ("voice", "text", "future", "enqueued")
+
+    def __init__(self, voice, text, future):
+        self.voice = voice
+        self.text = text
+        self.future = future
+        self.enqueued = time.perf_counter()
+
+
+class TTSDaemon:
+    """Serves synthesis requests from many clients through one KokoroManager"""
+
+    def __init__(self, manager, socket_path=DEFAULT_SOCKET_PATH, max_batch=8, batch_window_ms=15):
+        """
+        Args:
+            manager: KokoroManager whose model and voices are shared by all clients
+            socket_path: Unix socket to listen on
+            max_batch: Most sentences synthesized per batch
+            batch_window_ms: How long the first sentence of a batch waits for
+                others to join; bounds the latency batching can add
+        """
+        self.manager = manager
+        self.socket_path = Path(socket_path)
+        self.max_batch = max_batch
+        self.batch_window = batch_window_ms / 1000
+        self.jobs = asyncio.Queue()
+        self._server = None
+        self._batcher = None
+        self._connections = set()
+        self._stats = {
+            "requests": 0,
+            "sentences": 0,
+            "batches": 0,
+            "deduplicated": 0,
+            "cancelled": 0,
+            "cancelled_requests": 0,
+            "errors": 0,
+            "max_queue_depth": 0,
+            "queue_depth_total": 0,
+            "queue_wait_seconds": 0.0,
+            "synthesis_seconds": 0.0,
+        }
+        self.batch_sizes = Counter()
+
+    async def start(self):
+        if self.socket_path.exists():
+            # A live daemon answers; a stale socket from a crashed one is removed
+            try:
+                _, writer = await asyncio.open_unix_connection(str(self.socket_path))
+                writer.close()
+                raise RuntimeError(f"TTS daemon already running on {self.socket_path}")
+            except (ConnectionRefusedError, FileNotFoundError):
+                self.socket_path.unlink(missing_ok=True)
+        self._server = await asyncio.start_unix_server(self._handle, path=str(self.socket_path))
+        os.chmod(self.socket_path, 0o600)
+        self._batcher = asyncio.create_task(self._run_batches())
+        print(f"TTS daemon listening on {self.socket_path}")
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        # Open connections outlive the listening socket; end them explicitly
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._batcher is not None:
+            self._batcher.cancel()
+            await asyncio.gather(self._batcher, return_exceptions=True)
+            self._batcher = None
+        while not self.jobs.empty():
+            job = self.jobs.get_nowait()
+            if not job.future.done():
+                job.future.set_exception(ConnectionError("TTS daemon stopped"))
+        self.socket_path.unlink(missing_ok=True)
+
+    async def synthesize(self, text, voice=None):
+        """Yield float audio for text one sentence at a time, via the shared batcher"""
+        self._stats["requests"] += 1
+        loop = asyncio.get_running_loop()
+        for sentence in SENTENCE_BOUNDARY.split(text.strip()):
+            if not sentence:
+                continue
+            job = _Job(voice or self.manager.voice_name, sentence, loop.create_future())
+            self.jobs.put_nowait(job)
+            depth = self.jobs.qsize()
+            self._stats["sentences"] += 1
+            self._stats["queue_depth_total"] += depth
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], depth)
+            yield await job.future
+
+    async def _run_batches(self):
+        while True:
+            batch = [await self.jobs.get()]
+            deadline = batch[0].enqueued + self.batch_window
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.perf_counter()
+                try:
+                    if timeout <= 0:
+                        # Window already spent waiting for the last batch: take what is queued
+                        job = self.jobs.get_nowait()
+                    else:
+                        job = await asyncio.wait_for(self.jobs.get(), timeout)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                batch.append(job)
+            await self._run_batch(batch)
+
+    async def _run_batch(self, batch):
+        now = time.perf_counter()
+        unique = {}
+        for job in batch:
+            # Futures of disconnected clients are already cancelled
+            if job.future.done():
+                self._stats["cancelled"] += 1
+                continue
+            self._stats["queue_wait_seconds"] += now - job.enqueued
+            unique.setdefault((job.voice, job.text), []).append(job)
+        if not unique:
+            return
+
+        # Group by voice so each pack is looked up once and stays hot
+        keys = sorted(unique, key=lambda key: key[0])
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        skipped = await asyncio.to_thread(self._synthesize_batch, keys, unique, loop)
+        self._stats["cancelled"] += skipped
+        self._stats["synthesis_seconds"] += time.perf_counter() - start
+        self._stats["batches"] += 1
+        self._stats["deduplicated"] += sum(len(jobs) - 1 for jobs in unique.values())
+        self.batch_sizes[len(keys)] += 1
+
+    def _synthesize_batch(self, keys, unique, loop):
+        skipped = 0
+        for key in keys:
+            # Requests cancelled while the batch ran no longer need this sentence
+            if all(job.future.done() for job in unique[key]):
+                skipped += len(unique[key])
+                continue
+            voice, text = key
+            try:
+                audio, _ = self.manager._synthesize(text, voice)
+                if isinstance(audio, torch.Tensor):
+                    audio = audio.cpu().numpy()
+                error = None
+            except Exception as e:
+                audio, error = None, e
+            # Resolve this sentence's requests now, while the batch goes on
+            loop.call_soon_threadsafe(self._resolve, unique[key], audio, error)
+        return skipped
+
+    def _resolve(self, jobs, audio, error):
+        """Hand one synthesized sentence to every job waiting on it (event loop side)"""
+        if error is not None:
+            self._stats["errors"] += 1
+        for job in jobs:
+            if job.future.done():
+                continue
+            if error is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(audio)
+
+    def stats(self):
+        """Queue depth, batch size distribution and timing totals"""
+        stats = dict(self._stats)
+        sentences = stats.pop("queue_depth_total")
+        batches = stats["batches"]
+        stats["queue_depth"] = self.jobs.qsize()
+        stats["mean_queue_depth"] = sentences / stats["sentences"] if stats["sentences"] else None
+        stats["batch_sizes"] = {str(size): count for size, count in sorted(self.batch_sizes.items())}
+        stats["mean_batch_size"] = (
+            sum(size * count for size, count in self.batch_sizes.items()) / batches if batches else None
+        )
+        voices = getattr(self.manager, "voices", None)
+        if voices is not None:
+            stats["voices"] = voices.stats()
+        return stats
+
+    async def _handle(self, reader, writer):
+        lock = asyncio.Lock()
+        tasks = set()
+        synthesis = {}  # request id -> task serving it
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    await self._send(writer, lock, {"id": None, "error": "invalid JSON"})
+                    continue
+                op = request.get("op")
+                if op == "stats":
+                    await self._send(writer, lock, {"id": request.get("id"), "stats": self.stats()})
+                elif op == "synthesize":
+                    request_id = request.get("id")
+                    task = asyncio.create_task(self._serve_synthesis(request, writer, lock))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    synthesis[request_id] = task
+                    task.add_done_callback(lambda _, key=request_id: synthesis.pop(key, None))
+                elif op == "cancel":
+                    # Cancelling the task cancels the sentence future it awaits,
+                    # so the batcher skips that sentence and nothing more is queued
+                    task = synthesis.pop(request.get("id"), None)
+                    if task is not None and task.cancel():
+                        self._stats["cancelled_requests"] += 1
+                else:
+                    await self._send(writer, lock, {"id": request.get("id"), "error": f"unknown op: {op}"})
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._connections.discard(connection)
+            writer.close()
+
+    async def _serve_synthesis(self, request, writer, lock):
+        request_id = request.get("id")
+        try:
+            seq = 0
+            async for audio in self.synthesize(request.get("text") or "", request.get("voice")):
+                payload = to_pcm16(audio).tobytes()
+                await self._send(writer, lock, {"id": request_id, "seq": seq, "bytes": len(payload)}, payload)
+                seq += 1
+            await self._send(writer, lock, {"id": request_id, "done": True})
+        except ConnectionError:
+            pass
+        except Exception as e:
+            print(f"Error synthesizing request {request_id}: {e}")
+            try:
+                await self._send(writer, lock, {"id": request_id, "error": str(e)})
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def _send(writer, lock, header, payload=None):
+        async with lock:
+            writer.write(json.dumps(header).encode() + b"\n")
+            if payload:
+                writer.write(payload)
+            await writer.drain()
+
+
+class TTSClient:
+    """Async client for TTSDaemon; one connection, many concurrent requests"""
+
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH):
+        self.socket_path = str(socket_path)
+        self._reader = None
+        self._writer = None
+        self._reader_task = None
+        self._pending = {}
+        self._next_id = 0
+        self._connect_lock = asyncio.Lock()
+
+    async def _ensure_connected(self):
+        async with self._connect_lock:
+            if self._writer is not None and not self._writer.is_closing():
+                return
+            self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+            self._reader_task = asyncio.create_task(self._read_responses())
+
+    async def _request(self, header):
+        await self._ensure_connected()
+        self._next_id += 1
+        request_id = self._next_id
+        responses = asyncio.Queue()
+        self._pending[request_id] = responses
+        self._writer.write(json.dumps(dict(header, id=request_id)).encode() + b"\n")
+        await self._writer.drain()
+        return request_id, responses
+
+    async def _read_responses(self):
+        error = ConnectionError("TTS daemon closed the connection")
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                header = json.loads(line)
+                payload = await self._reader.readexactly(header["bytes"]) if header.get("bytes") else b""
+                responses = self._pending.get(header.get("id"))
+                if responses is not None:
+                    responses.put_nowait((header, payload))
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+            error = ConnectionError(f"TTS daemon connection failed: {e}")
+        finally:
+            for responses in self._pending.values():
+                responses.put_nowait(({"error": error}, b""))
+            self._writer.close()
+            self._writer = None
+
+    async def synthesize(self, text, voice=None):
+        """
+        Yield float32 audio (24kHz) for text, one sentence at a time.
+        Closing the generator early (or cancelling the task reading it)
+        cancels the request on the daemon.
+        """
+        request_id, responses = await self._request({"op": "synthesize", "text": text, "voice": voice})
+        finished = False
+        try:
+            while True:
+                header, payload = await responses.get()
+                if "error" in header:
+                    finished = True
+                    error = header["error"]
+                    raise error if isinstance(error, Exception) else RuntimeError(error)
+                if header.get("done"):
+                    finished = True
+                    return
+                yield np.frombuffer(payload, dtype="<i2").astype(np.float32) / 32767
+        finally:
+            self._pending.pop(request_id, None)
+            if not finished:
+                self._cancel(request_id)
+
+    def _cancel(self, request_id):
+        """Tell the daemon to stop a request nobody is reading any more"""
+        if self._writer is not None and not self._writer.is_closing():
+            # No drain: this runs from finally blocks of cancelled tasks
+            self._writer.write(json.dumps({"op": "cancel", "id": request_id}).encode() + b"\n")
+
+    async def stats(self):
+        request_id, responses = await self._request({"op": "stats"})
+        try:
+            header, _ = await responses.get()
+        finally:
+            self._pending.pop(request_id, None)
+        if "error" in header:
+            raise ConnectionError(str(header["error"]))
+        return header["stats"]
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+            self._reader_task = None
+
+
+class RemoteKokoroManager(KokoroManager):
+    """KokoroManager that synthesizes through a TTSDaemon instead of a local model"""
+
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH, voice_name='af', stream_server=None):
+        self.client = TTSClient(socket_path)
+        self.voice_name = voice_name
+        self.stream_server = stream_server
+        self.phoneme_cache = None
+
+        self._setup_queue()
+        self._setup_audio()
+
+    async def generate_speech(self, text, output_file=None, voice=None, cancel=None):
+        """
+        Fetch speech for text from the daemon. Cancelling the task, or setting
+        the threading.Event cancel (checked as each sentence arrives), sends
+        the daemon a cancel for the rest of the request.
+        """
+        chunks = []
+        stream = self.client.synthesize(text, voice or self.voice_name)
+        try:
+            async for chunk in stream:
+                if cancel is not None and cancel.is_set():
+                    return None
+                chunks.append(chunk)
+        except (OSError, RuntimeError) as e:
+            print(f"Error generating speech via TTS daemon: {e}")
+            return None
+        finally:
+            # Closing an unfinished stream is what sends the cancel op
+            await stream.aclose()
+        return np.concatenate(chunks) if chunks else None
+
+    async def stop_audio(self):
+        await super().stop_audio()
+        await self.client.close()
+
+
+async def _serve(args):
+    manager = KokoroManager(
+        voice_name=args.voice,
+        phoneme_cache_file=args.phoneme_cache,
+        quantize=args.quantize,
+    )
+    daemon = await TTSDaemon(
+        manager, args.socket, max_batch=args.max_batch, batch_window_ms=args.batch_window_ms
+    ).start()
+    try:
+        while True:
+            await asyncio.sleep(args.report_seconds)
+            stats = daemon.stats()
+            if stats["sentences"]:
+                print(f"TTS daemon: {stats['requests']} requests, queue depth {stats['queue_depth']} "
+                      f"(max {stats['max_queue_depth']}), mean batch {stats['mean_batch_size'] or 0:.2f}")
+    finally:
+        await daemon.stop()
+        if manager.phoneme_cache is not None:
+            manager.phoneme_cache.save()
+
+
+async def _print_stats(socket_path):
+    client = TTSClient(socket_path)
+    try:
+        print(json.dumps(await client.stats(), indent=2))
+    finally:
+        await client.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the shared Kokoro TTS daemon")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH)
+    parser.add_argument("--voice", default="af", help="Default voice")
+    parser.add_argument("--quantize", action="store_true", help="Use the int8 CPU model")
+    parser.add_argument("--phoneme-cache", help="JSON file to persist the phoneme cache")
+    parser.add_argument("--max-batch", type=int, default=8)
+    parser.add_argument("--batch-window-ms", type=float, default=15)
+    parser.add_argument("--report-seconds", type=float, default=60, help="Interval of the stats log line")
+    parser.add_argument("--stats", action="store_true", help="Print a running daemon's stats and exit")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_print_stats(args.socket) if args.stats else _serve(args))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,89 @@
+# src/models/voice_registry.py
+from collections import OrderedDict
+import threading
+import torch
+from src.utils.model_downloader import ModelDownloader
+
+
+class VoiceRegistry:
+    """
+    Loads Kokoro voice packs on demand and keeps them under a memory budget.
+
+    Packs are memory-mapped from disk when torch supports it (CPU), so an
+    idle pack costs page cache rather than heap. The least recently used
+    unpinned packs are evicted once the budget is exceeded. One registry is
+    shared by everything synthesizing with the same model.
+    """
+
+    def __init__(self, device="cpu", memory_budget_bytes=32 * 1024 * 1024):
+        self.device = device
+        self.memory_budget_bytes = memory_budget_bytes
+        self._packs = OrderedDict()
+        self._pinned = set()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "loads": 0, "evictions": 0}
+
+    def get(self, voice_name):
+        """Return the voice pack tensor for voice_name, loading it if needed"""
+        with self._lock:
+            pack = self._packs.get(voice_name)
+            if pack is not None:
+                self._packs.move_to_end(voice_name)
+                self._stats["hits"] += 1
+                return pack
+
+        # Load outside the lock so other voices stay available meanwhile
+        pack = self._load(voice_name)
+        with self._lock:
+            if voice_name not in self._packs:
+                self._packs[voice_name] = pack
+                self._stats["loads"] += 1
+            pack = self._packs[voice_name]
+            self._packs.move_to_end(voice_name)
+            self._evict(keep=voice_name)
+        return pack
+
+    def pin(self, voice_name):
+        """Load voice_name and never evict it"""
+        self._pinned.add(voice_name)
+        return self.get(voice_name)
+
+    def unpin(self, voice_name):
+        self._pinned.discard(voice_name)
+
+    def _load(self, voice_name):
+        path = str(ModelDownloader.get_voice_path(voice_name))
+        print(f"Loading voice pack: {voice_name}")
+        try:
+            pack = torch.load(path, weights_only=True, map_location="cpu", mmap=True)
+        except (TypeError, RuntimeError):
+            # Older torch, or a legacy (non-zip) file that cannot be mapped
+            pack = torch.load(path, weights_only=True, map_location="cpu")
+        return pack.to(self.device) if self.device != "cpu" else pack
+
+    def _evict(self, keep):
+        for name in list(self._packs):
+            if self._memory_bytes() <= self.memory_budget_bytes:
+                break
+            if name == keep or name in self._pinned:
+                continue
+            del self._packs[name]
+            self._stats["evictions"] += 1
+            print(f"Evicted voice pack: {name}")
+
+    def _memory_bytes(self):
+        return sum(pack.numel() * pack.element_size() for pack in self._packs.values())
+
+    def loaded(self):
+        """Names of the voice packs currently in memory, least recent first"""
+        with self._lock:
+            return list(self._packs)
+
+    def stats(self):
+        with self._lock:
+            return dict(
+                self._stats,
+                loaded=len(self._packs),
+                memory_bytes=self._memory_bytes(),
+                budget_bytes=self.memory_budget_bytes,
+            )
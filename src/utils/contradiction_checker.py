@@ -1,9 +1,17 @@
 # src/utils/contradiction_checker.py
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import re
+from .truth_dedup import NearDuplicateIndex, claim
 
 class ContradictionChecker:
-    def __init__(self):
+    def __init__(self, truth_index: Optional[NearDuplicateIndex] = None):
+        """
+        Args:
+            truth_index: Optional index the red truths were declared into
+                (TruthBattleSystem.truth_index). The logical check then only
+                reads truths with the statement's exact content words.
+        """
+        self.truth_index = truth_index
         self.contradiction_types = {
             "temporal": self._check_temporal_contradiction,
             "spatial": self._check_spatial_contradiction,
@@ -58,7 +66,7 @@ class ContradictionChecker:
     def _check_logical_contradiction(self, statement: str, facts: Dict) -> Dict:
         """Check for logical impossibilities"""
         # Example: If A implies B, and B implies C, then A must imply C
-        for fact in facts.get("red_truths", []):
+        for fact in self._logical_candidates(statement, facts.get("red_truths", [])):
             if logical_conflict := self._find_logical_conflict(statement, fact):
                 return {
                     "statement": statement,
@@ -102,11 +110,41 @@ class ContradictionChecker:
                 return f"Conflicts with established fact: {fact}"
         return None
     
+    def _is_conflicting_location(self, location: str, fact: str) -> bool:
+        """Check if a fact places the subject somewhere incompatible with location"""
+        # Placeholder until location tracking per character exists
+        return False
+    
+    def _logical_candidates(self, statement: str, red_truths: List[str]) -> List[str]:
+        """Red truths that could be a plain negation of statement"""
+        if self.truth_index is None or not red_truths:
+            return red_truths
+        # A plain negation has exactly the same content words, so the index
+        # narrows the truths down without re-reading them. Red truths it does
+        # not hold are still checked one by one.
+        known = set(red_truths)
+        candidates = [fact for fact in self.truth_index.same_content(statement) if fact in known]
+        unindexed = known - self.truth_index.texts()
+        if unindexed:
+            candidates += [fact for fact in red_truths if fact in unindexed]
+        return candidates
+    
     def _find_logical_conflict(self, statement: str, fact: str) -> str:
-        """Find logical conflicts between statement and fact"""
-        # Implement logical contradiction detection
-        # This is a placeholder for more sophisticated logic
-        return None
+        """
+        Find plain negation conflicts between statement and fact: the same
+        names in the same order and the same verb, with only the negation
+        differing, e.g. "Eva did not enter the study" against 「Eva entered
+        the study」. Anything looser is left to the LLM validator.
+        """
+        statement_words, statement_negated = claim(statement)
+        fact_words, fact_negated = claim(fact)
+        if statement_negated == fact_negated or len(statement_words) < 2:
+            return None
+        if statement_words != fact_words:
+            return None
+        if fact_negated:
+            return f"Statement asserts what a red truth denies: {fact}"
+        return f"Statement denies a red truth: {fact}"
     
     def _check_locked_room_rules(self, statement: str, facts: Dict) -> str:
         """Check if locked room mechanics are violated"""
@@ -0,0 +1,262 @@
+# src/utils/evidence_graph.py
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+import heapq
+import re
+from .truth_dedup import NEGATIONS, SENTENCE_START, STOPWORDS
+
+ENTITY_KINDS = ("character", "location", "time", "object")
+FACT_KINDS = ("statement", "evidence")
+
+Node = Tuple[str, str]
+
+_TIME_PATTERN = re.compile(
+    r"\b(\d{1,2})(?::(\d{2}))?\s*([AaPp])\.?[Mm]\b\.?"  # 9 PM, 9:30pm, 10:15 a.m.
+    r"|\b(\d{1,2}):(\d{2})\b"                           # 21:30
+)
+_CAPITALIZED_PATTERN = re.compile(r"\b[A-Z][a-z]+(?:'s)?\b")
+
+
+def parse_time(value: Union[str, int]) -> Optional[int]:
+    """Minutes after midnight for '9 PM', '9:30pm', '21:30' (or minutes as-is)"""
+    if isinstance(value, int):
+        return value
+    match = _TIME_PATTERN.search(value or "")
+    return _minutes(match) if match else None
+
+
+def _minutes(match) -> Optional[int]:
+    if match.group(1) is not None:
+        hour, minute = int(match.group(1)), int(match.group(2) or 0)
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if match.group(3).lower() == "p" else 0)
+    else:
+        hour, minute = int(match.group(4)), int(match.group(5))
+    if hour > 23 or minute > 59:
+        return None
+    return hour * 60 + minute
+
+
+def _time_key(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class EvidenceGraph:
+    """
+    Incremental entity-relationship index over game evidence.
+
+    Entities (characters, locations, times, objects) and facts (statements
+    and physical evidence) are nodes; a fact is linked to every entity it
+    mentions or is explicitly tied to. Queries walk adjacency sets instead
+    of scanning every fact, e.g. everything linking Eva to the study after
+    9 PM is the intersection of two neighbour sets filtered by time.
+
+    Entities are found by matching the registered vocabulary
+    (case-insensitive), clock times, and capitalized words that do not
+    start a sentence (taken to be characters).
+    """
+
+    def __init__(self):
+        self.nodes: Dict[Node, Dict] = {}
+        self.edges: Dict[Node, Set[Node]] = defaultdict(set)
+        self._vocabulary: Dict[str, Node] = {}
+        self._pattern: Optional[re.Pattern] = None
+        self._unlinked: Set[Node] = set()
+        self._superseded: Set[Node] = set()
+        self._times: Set[Node] = set()
+        self._fact_seq: Dict[Node, int] = {}
+        self._seq = 0
+
+    def add_entity(self, kind: str, name: str) -> Node:
+        """Register an entity so it is recognized in any text added later"""
+        if kind not in ENTITY_KINDS:
+            raise ValueError(f"Unknown entity kind: {kind}")
+        if kind == "time":
+            minutes = parse_time(name)
+            if minutes is None:
+                raise ValueError(f"Unrecognized time: {name}")
+            node = ("time", _time_key(minutes))
+            if node not in self.nodes:
+                self.nodes[node] = {"kind": "time", "label": name.strip(), "minutes": minutes}
+                self._times.add(node)
+            return node
+
+        key = name.strip().lower()
+        node = self._vocabulary.get(key)
+        if node is None:
+            node = (kind, key)
+            self.nodes[node] = {"kind": kind, "label": name.strip()}
+            self._vocabulary[key] = node
+            self._pattern = None
+        return node
+
+    def entity(self, name: str) -> Optional[Node]:
+        """Resolve a name or time ('Eva', 'the study', '9 PM') to its node"""
+        minutes = parse_time(name)
+        if minutes is not None:
+            node = ("time", _time_key(minutes))
+            return node if node in self.nodes else None
+        key = name.strip().lower()
+        if key.startswith("the "):
+            key = key[4:]
+        return self._vocabulary.get(key)
+
+    def extract(self, text: str) -> Set[Node]:
+        """Entities mentioned in text; unseen times and characters are added"""
+        found = set()
+        spans = []
+        for match in self._vocabulary_matches(text):
+            found.add(self._vocabulary[match.group(0).lower()])
+            spans.append(match.span())
+
+        for match in _TIME_PATTERN.finditer(text):
+            minutes = _minutes(match)
+            if minutes is not None:
+                found.add(self.add_entity("time", match.group(0)))
+                spans.append(match.span())
+
+        for match in _CAPITALIZED_PATTERN.finditer(text):
+            start, end = match.span()
+            word = match.group(0)
+            if word.endswith("'s"):
+                word = word[:-2]
+            if (word.lower() in STOPWORDS or word.lower() in NEGATIONS
+                    or any(s <= start < e for s, e in spans)
+                    or SENTENCE_START.search(text, 0, start)):
+                continue
+            found.add(self.add_entity("character", word))
+        return found
+
+    def add_fact(self, kind: str, fact_id: str, text: str = "",
+                 links: Iterable[Tuple[str, str]] = (), **attrs) -> Node:
+        """
+        Add (or replace) a fact and link it to the entities in its text plus
+        the explicit (kind, name) links. Extra attrs are stored on the node.
+        """
+        if kind not in FACT_KINDS:
+            raise ValueError(f"Unknown fact kind: {kind}")
+        node = (kind, fact_id)
+        if node in self.nodes:
+            self._unlink(node)
+            self._superseded.discard(node)
+
+        self._seq += 1
+        self.nodes[node] = dict(attrs, kind=kind, id=fact_id, text=text, seq=self._seq, current=True)
+        self._fact_seq[node] = self._seq
+        entities = self.extract(text) if text else set()
+        for entity_kind, name in links:
+            if name:
+                entities.add(self.add_entity(entity_kind, name))
+        for entity in entities:
+            self.edges[node].add(entity)
+            self.edges[entity].add(node)
+        if not entities:
+            self._unlinked.add(node)
+        return node
+
+    def supersede(self, node: Node):
+        """Mark a fact as replaced by a newer version; it stays queryable"""
+        if node in self.nodes:
+            self.nodes[node]["current"] = False
+            self._superseded.add(node)
+
+    def _unlink(self, node: Node):
+        for entity in self.edges.pop(node, set()):
+            self.edges[entity].discard(node)
+        self._unlinked.discard(node)
+
+    def neighbors(self, node: Node, kind: Optional[str] = None) -> Set[Node]:
+        return {n for n in self.edges.get(node, ()) if kind is None or n[0] == kind}
+
+    def linking(self, *names: str, after: Union[str, int, None] = None,
+                before: Union[str, int, None] = None, include_superseded: bool = True) -> List[Dict]:
+        """
+        Facts linked to every named entity, optionally only those tied to a
+        time within [after, before] (same evening; no wrap past midnight).
+        Returns fact attribute dicts, oldest first.
+        """
+        nodes = []
+        for name in names:
+            node = self.entity(name)
+            if node is None:
+                return []
+            nodes.append(node)
+        if not nodes:
+            return []
+
+        # Entities only ever link to facts, so each neighbourhood is a fact set;
+        # intersect from the smallest one outwards
+        fact_sets = sorted((self.edges.get(node, set()) for node in nodes), key=len)
+        candidates = fact_sets[0].intersection(*fact_sets[1:])
+        if not include_superseded:
+            candidates -= self._superseded
+        if after is not None or before is not None:
+            low = parse_time(after) if after is not None else 0
+            high = parse_time(before) if before is not None else 24 * 60
+            window = {node for node in self._times if low <= self.nodes[node]["minutes"] <= high}
+            candidates = {fact for fact in candidates if not window.isdisjoint(self.edges[fact])}
+        return [self.nodes[fact] for fact in sorted(candidates, key=self._fact_seq.__getitem__)]
+
+    def relevant(self, text: str, limit: Optional[int] = None, include_unlinked: bool = True,
+                 include_superseded: bool = False) -> List[Dict]:
+        """
+        Facts sharing entities with text, most shared entities first (then
+        newest). Facts that mention no entity at all cannot be ruled out by
+        entity overlap, so they are included unless include_unlinked is False.
+        """
+        excluded = set() if include_superseded else self._superseded
+        scores = Counter(chain.from_iterable(
+            self.edges.get(entity, set()) - excluded for entity in self._lookup(text)
+        ))
+        if include_unlinked:
+            for fact in self._unlinked - excluded:
+                scores.setdefault(fact, 0)
+
+        if limit is None or limit >= len(scores):
+            ranked = sorted(scores, key=lambda fact: (scores[fact], self._fact_seq[fact]), reverse=True)
+            return [self.nodes[fact] for fact in ranked]
+        if limit <= 0:
+            return []
+
+        # Most queries touch far more facts than they return: find the score
+        # cutoff at C speed, then break ties at the cutoff by recency
+        cutoff = heapq.nlargest(limit, scores.values())[-1]
+        above = sorted(
+            (fact for fact, score in scores.items() if score > cutoff),
+            key=lambda fact: (scores[fact], self._fact_seq[fact]), reverse=True
+        )
+        ties = heapq.nlargest(
+            limit - len(above),
+            (fact for fact, score in scores.items() if score == cutoff),
+            key=self._fact_seq.__getitem__
+        )
+        return [self.nodes[fact] for fact in above + ties]
+
+    def _lookup(self, text: str) -> Set[Node]:
+        """Like extract() but never adds nodes; queries must not grow the graph"""
+        found = {self._vocabulary[m.group(0).lower()] for m in self._vocabulary_matches(text)}
+        for match in _TIME_PATTERN.finditer(text):
+            minutes = _minutes(match)
+            if minutes is not None and ("time", _time_key(minutes)) in self.nodes:
+                found.add(("time", _time_key(minutes)))
+        return found
+
+    def _vocabulary_matches(self, text: str):
+        if not self._vocabulary:
+            return ()
+        if self._pattern is None:
+            # Longest names first so "guest room" wins over "room"
+            names = sorted(self._vocabulary, key=len, reverse=True)
+            self._pattern = re.compile(
+                r"\b(?:" + "|".join(re.escape(name) for name in names) + r")\b", re.IGNORECASE
+            )
+        return self._pattern.finditer(text)
+
+    def stats(self) -> Dict[str, int]:
+        counts: Dict[str, int] = defaultdict(int)
+        for kind, _ in self.nodes:
+            counts[kind] += 1
+        counts["edges"] = sum(len(targets) for targets in self.edges.values()) // 2
+        return dict(counts)
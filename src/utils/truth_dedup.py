@@ -0,0 +1,238 @@
+# src/utils/truth_dedup.py
+from typing import Dict, FrozenSet, Hashable, List, Optional, Set, Tuple
+import random
+import re
+import zlib
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "but", "of", "to", "in", "on", "at", "by",
+    "for", "from", "with", "into", "inside", "was", "were", "is", "are", "be",
+    "been", "had", "has", "have", "did", "does", "do", "that", "this", "it",
+    "its", "there", "their", "they", "he", "she", "his", "her", "as", "then",
+    "which", "who", "whom", "when", "while", "also", "any", "some", "one",
+}
+NEGATIONS = {"not", "no", "never", "nobody", "none", "nothing", "neither", "nor", "cannot", "without"}
+# Words that flip a fact without changing much else ("before 9 PM" vs "after 9 PM")
+QUALIFIERS = {
+    "before", "after", "during", "until", "since", "inside", "outside", "into",
+    "above", "below", "under", "behind", "upstairs", "downstairs", "alive", "dead",
+    "open", "closed", "locked", "unlocked", "early", "late", "first", "last",
+}
+
+# Matches (via search with endpos) when a sentence starts at endpos
+SENTENCE_START = re.compile(r"(?:^|[.!?「『\"(]\s*)$")
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9]+(?::[0-9]{2})?")
+
+
+def _normalize(text: str) -> str:
+    text = text.replace("’", "'")
+    return re.sub(r"n't\b", " not", text)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into word tokens, keeping clock times like 9:30 whole"""
+    return _TOKEN_PATTERN.findall(_normalize(text))
+
+
+def _capitalized_words(text: str):
+    """Yield (lowercased word, starts a sentence) for capitalized non-stopwords"""
+    text = _normalize(text)
+    for match in _TOKEN_PATTERN.finditer(text):
+        word = match.group(0)
+        lower = word.lower()
+        if not word[0].isupper() or lower in STOPWORDS or lower in NEGATIONS:
+            continue
+        yield lower, bool(SENTENCE_START.search(text, 0, match.start()))
+
+
+def _stem(word: str) -> str:
+    """Very light suffix stripping so 'used'/'uses'/'use' share a shingle"""
+    if word.endswith("ing") and len(word) > 5:
+        word = word[:-3]
+    elif word.endswith("ed") and len(word) > 3:
+        word = word[:-2] if len(word) > 4 else word[:-1]
+    elif word.endswith("es") and len(word) > 4:
+        word = word[:-2]
+    elif word.endswith("s") and len(word) > 3 and not word.endswith("ss"):
+        word = word[:-1]
+    if len(word) > 2 and word.endswith("e"):
+        word = word[:-1]
+    return word
+
+
+def content_shingles(text: str) -> Set[str]:
+    """Order-insensitive shingles: stemmed content words of the statement"""
+    return {
+        _stem(token.lower())
+        for token in tokenize(text)
+        if token.lower() not in STOPWORDS and token.lower() not in NEGATIONS
+    }
+
+
+def claim(text: str) -> Tuple[Tuple[str, ...], bool]:
+    """
+    What a statement asserts, for spotting plain negations: its stemmed
+    content words in order (names included, negations dropped) and whether
+    it is negated. The words are content_shingles(text) in sentence order.
+    """
+    tokens = [token.lower() for token in tokenize(text)]
+    words = tuple(_stem(t) for t in tokens if t not in STOPWORDS and t not in NEGATIONS)
+    return words, any(t in NEGATIONS for t in tokens)
+
+
+def fact_guard(text: str, guard_words: FrozenSet[str] = frozenset()) -> Tuple:
+    """
+    Parts of a statement that must match exactly for two statements to be
+    the same fact: numbers/times, proper nouns, negation, and qualifier
+    words (QUALIFIERS plus guard_words, e.g. location nouns).
+
+    Proper nouns are kept in order of first appearance, so "Eva killed
+    Kinzo" and "Kinzo killed Eva" never match. A capitalized word that
+    starts a sentence may just be capitalized ("Study door was locked"),
+    so it is left to leading_words() instead.
+    """
+    tokens = tokenize(text)
+    numbers = frozenset(t for t in tokens if t[0].isdigit())
+    names = []
+    for word, sentence_start in _capitalized_words(text):
+        if not sentence_start and word not in names:
+            names.append(word)
+    lowered = [t.lower() for t in tokens]
+    negated = any(t in NEGATIONS for t in lowered)
+    qualifiers = frozenset(t for t in lowered if t in QUALIFIERS or t in guard_words)
+    return numbers, tuple(names), negated, qualifiers
+
+
+def leading_words(text: str) -> FrozenSet[str]:
+    """
+    Capitalized sentence-initial words that may or may not be names, as
+    shingles. Two statements can only be the same fact if each one's
+    leading words also appear in the other.
+    """
+    return frozenset(
+        _stem(word) for word, sentence_start in _capitalized_words(text)
+        if sentence_start
+    )
+
+
+class NearDuplicateIndex:
+    """
+    Incremental MinHash/LSH index for spotting paraphrased statements.
+
+    Each statement is reduced to a MinHash signature over its content
+    shingles and filed into one bucket per LSH band (keyed together with its
+    fact guard). Lookups only compare against statements sharing a bucket,
+    so inserting stays cheap as the store grows. Candidates must also agree
+    on leading_words(), which the exact-match guard cannot hold.
+
+    With the default threshold of 1.0 only statements with exactly the same
+    content words merge; a single differing word ("study" vs "library") can
+    turn one fact into another. guard_words adds domain words (location
+    nouns) to the guard.
+    """
+
+    def __init__(self, num_perm: int = 60, bands: int = 20, threshold: float = 1.0, seed: int = 1,
+                 guard_words: Optional[Set[str]] = None):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.guard_words = frozenset(
+            word for phrase in guard_words or () for word in tokenize(phrase.lower())
+        )
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        self._buckets: List[Dict[Tuple, List[Hashable]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[Hashable, Tuple[int, ...]] = {}
+        self._shingles: Dict[Hashable, FrozenSet[str]] = {}
+        self._leading: Dict[Hashable, FrozenSet[str]] = {}
+        self._by_content: Dict[FrozenSet[str], List[Hashable]] = {}
+        self._texts: Dict[Hashable, str] = {}
+        self._text_set: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def signature(self, shingles: Set[str]) -> Tuple[int, ...]:
+        """MinHash signature of a shingle set"""
+        hashes = [zlib.crc32(s.encode()) for s in shingles]
+        return tuple(
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+            for a, b in self._perms
+        )
+
+    def _band_keys(self, signature: Tuple[int, ...], guard) -> List[Tuple]:
+        return [
+            (guard, signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    def _prepare(self, text: str):
+        shingles = frozenset(content_shingles(text))
+        if not shingles:
+            return None
+        signature = self.signature(shingles)
+        return shingles, signature, self._band_keys(signature, fact_guard(text, self.guard_words))
+
+    def shingles(self, item_id: Hashable) -> Optional[FrozenSet[str]]:
+        """Content shingles computed when item_id was indexed"""
+        return self._shingles.get(item_id)
+
+    def same_content(self, text: str) -> List[str]:
+        """Indexed texts with exactly the content words of text (any order, negated or not)"""
+        ids = self._by_content.get(frozenset(content_shingles(text)), ())
+        return [self._texts[item_id] for item_id in ids]
+
+    def texts(self) -> Set[str]:
+        """Every indexed text (read-only)"""
+        return self._text_set
+
+    def find(self, text: str) -> Optional[Hashable]:
+        """Return the id of the closest indexed near-duplicate of text, if any"""
+        prepared = self._prepare(text)
+        if prepared is None:
+            return None
+        shingles, signature, keys = prepared
+        leading = leading_words(text)
+
+        best_id, best_score = None, self.threshold
+        seen = set()
+        for bucket, key in zip(self._buckets, keys):
+            for item_id in bucket.get(key, ()):
+                if item_id in seen:
+                    continue
+                seen.add(item_id)
+                if not (leading <= self._shingles[item_id] and self._leading[item_id] <= shingles):
+                    continue
+                if shingles == self._shingles[item_id]:
+                    return item_id
+                if self.threshold >= 1.0:
+                    continue
+                other = self._signatures[item_id]
+                score = sum(x == y for x, y in zip(signature, other)) / self.num_perm
+                if score >= best_score:
+                    best_id, best_score = item_id, score
+        return best_id
+
+    def add(self, item_id: Hashable, text: str) -> bool:
+        """Index text under item_id. Returns False if text has no content words."""
+        prepared = self._prepare(text)
+        if prepared is None:
+            return False
+        shingles, signature, keys = prepared
+        self._signatures[item_id] = signature
+        self._shingles[item_id] = shingles
+        self._leading[item_id] = leading_words(text)
+        self._by_content.setdefault(shingles, []).append(item_id)
+        self._texts[item_id] = text
+        self._text_set.add(text)
+        for bucket, key in zip(self._buckets, keys):
+            bucket.setdefault(key, []).append(item_id)
+        return True
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import numpy as np
+from src.models.audio_scheduler import PRIORITY_URGENT, AudioScheduler
+from src.models.audio_stream import AudioStreamServer, _StreamClient
+
+
+def test_priority_order_and_drain():
+    async def run():
+        scheduler = AudioScheduler()
+        scheduler.put("second")
+        scheduler.put("first", priority=PRIORITY_URGENT)
+        scheduler.put("third")
+        scheduler.close()
+        spoken = []
+        while (utterance := await scheduler.get()) is not None:
+            spoken.append(utterance.text)
+        return spoken
+
+    assert asyncio.run(run()) == ["first", "second", "third"]
+
+
+def test_barge_in_cancels_task_and_thread_work():
+    async def run():
+        scheduler = AudioScheduler()
+        scheduler.put("stale follow-up")
+        cancel = threading.Event()
+        task = asyncio.create_task(asyncio.sleep(10))
+        scheduler.started(task, cancel)
+        scheduler.barge_in()
+        await asyncio.wait({task})
+        scheduler.finished(task)
+        return scheduler, cancel, task
+
+    scheduler, cancel, task = asyncio.run(run())
+    stats = scheduler.stats()
+    assert task.cancelled() and cancel.is_set()
+    assert scheduler.empty()
+    assert (stats["interrupted"], stats["dropped"]) == (1, 1)
+    assert stats["mean_cancel_latency_seconds"] is not None
+
+
+def test_idle_get_does_not_wake():
+    async def run():
+        scheduler = AudioScheduler()
+        getter = asyncio.create_task(scheduler.get())
+        await asyncio.sleep(0.2)
+        wakeups = scheduler.stats()["wakeups"]
+        scheduler.put("hello")
+        return wakeups, (await getter).text
+
+    assert asyncio.run(run()) == (0, "hello")
+
+
+def test_stream_flush_drops_queued_frames():
+    async def run():
+        server = AudioStreamServer(frame_ms=100)
+        client = _StreamClient(writer=None, rate=24000, max_buffered_frames=100)
+        server.clients.add(client)
+        server.publish(np.zeros(24000, dtype=np.float32))
+        queued = client.queue.qsize()
+        client.offer(None)
+        server.flush()
+        return queued, client.queue.get_nowait(), client.queue.qsize(), server.stats()
+
+    queued, first, remaining, stats = asyncio.run(run())
+    assert queued == 10
+    # The end-of-stream marker survives the flush
+    assert first is None and remaining == 0
+    assert stats["frames_flushed"] == 10
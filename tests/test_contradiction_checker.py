@@ -0,0 +1,46 @@
+import pytest
+from src.game.truth_battle import TruthBattleSystem
+from src.utils.contradiction_checker import ContradictionChecker
+
+
+def logical_conflicts(statement, red_truths, indexed):
+    if indexed:
+        battle = TruthBattleSystem()
+        for truth in red_truths:
+            battle.declare_red_truth(truth)
+        checker = ContradictionChecker(truth_index=battle.truth_index)
+    else:
+        checker = ContradictionChecker()
+    facts = {"red_truths": list(red_truths)}
+    return [c for c in checker.check_statement(statement, facts) if c["type"] == "logical"]
+
+
+@pytest.mark.parametrize("indexed", [True, False])
+@pytest.mark.parametrize("statement, truth", [
+    ("Nobody saw Eva in the study.", "Eva was in the study."),
+    ("Eva did not kill Kinzo.", "Kinzo killed Eva."),
+    ("Eva was not killed.", "Eva killed Kinzo."),
+    ("Eva entered the study.", "Nobody entered the study."),
+])
+def test_not_a_plain_negation(statement, truth, indexed):
+    assert logical_conflicts(statement, [truth], indexed) == []
+
+
+@pytest.mark.parametrize("indexed", [True, False])
+@pytest.mark.parametrize("statement, truth", [
+    ("Eva did not enter the study.", "Eva entered the study."),
+    ("Eva wasn't in the study at 9:30.", "Eva was in the study at 9:30."),
+    ("Kinzo killed Eva.", "Kinzo never killed Eva."),
+])
+def test_plain_negation_is_refuted(statement, truth, indexed):
+    conflicts = logical_conflicts(statement, ["The master key was lost.", truth], indexed)
+    assert [c["details"]["conflicting_fact"] for c in conflicts] == [truth]
+
+
+def test_unindexed_red_truths_are_still_checked():
+    battle = TruthBattleSystem()
+    battle.declare_red_truth("The master key was lost.")
+    checker = ContradictionChecker(truth_index=battle.truth_index)
+    facts = {"red_truths": ["The master key was lost.", "Eva entered the study."]}
+    conflicts = checker.check_statement("Eva did not enter the study.", facts)
+    assert [c["details"]["conflicting_fact"] for c in conflicts] == ["Eva entered the study."]
@@ -0,0 +1,87 @@
+import asyncio
+from src.game.evidence_system import EvidenceSystem
+from src.game.game_master import GameMaster
+
+OPENING = (
+    "Thunder rolls over the island. Kinzo was found dead in the study at 9:30 PM. "
+    'Eva: "I never left the library that night." '
+    "「Nobody entered the study after 10 PM.」 "
+    '"The chapel door was open," said Rosa.'
+)
+
+
+def test_record_narration_indexes_quotes_and_sentences():
+    evidence = EvidenceSystem()
+    evidence.record_narration(OPENING)
+    assert evidence.established_facts["witness_statements"] == {
+        "Eva": "I never left the library that night.",
+        "Rosa": "The chapel door was open",
+    }
+    lines = evidence.format_relevant("Where was Kinzo at 9:30 PM?").splitlines()
+    assert "- Narrated: Kinzo was found dead in the study at 9:30 PM." in lines
+    # Red truths are indexed separately, never as narration
+    assert not any("Nobody entered" in line for line in lines)
+
+
+def test_leading_adverb_is_not_a_witness():
+    evidence = EvidenceSystem()
+    evidence.record_narration(
+        'Later, "I saw the witch in the garden," said Eva. '
+        'Then, "The chapel door was open," Rosa whispered.'
+    )
+    assert evidence.established_facts["witness_statements"] == {
+        "Eva": "I saw the witch in the garden",
+        "Rosa": "The chapel door was open",
+    }
+    assert "Later says" not in evidence.format_relevant("garden")
+
+
+def test_bare_speaker_needs_known_character():
+    evidence = EvidenceSystem()
+    evidence.record_narration('Suddenly: "Who is in the garden?" Eva: "I am."')
+    assert evidence.established_facts["witness_statements"] == {"Eva": "I am."}
+
+
+def test_changed_story_is_versioned():
+    evidence = EvidenceSystem()
+    evidence.record_narration('Eva: "I was in the library at 9 PM."')
+    result = evidence.record_narration('Eva: "I was in the garden at 9 PM."')
+    assert result == ["Statement from Eva changed (version 2)"]
+    lines = evidence.format_relevant("Eva").splitlines()
+    assert lines == ["- Eva says (changed story, version 2): I was in the garden at 9 PM."]
+
+
+def test_new_subject_keeps_earlier_statement():
+    evidence = EvidenceSystem()
+    evidence.record_narration('Eva: "I was in the library at 9 PM."')
+    result = evidence.record_narration('Eva: "Kinzo kept the master key in his desk."')
+    assert result == ["Statement recorded from Eva"]
+    lines = evidence.format_relevant("Was Eva in the library at 9 PM?").splitlines()
+    assert lines[0] == "- Eva says: I was in the library at 9 PM."
+    assert not any("changed story" in line for line in lines)
+
+
+def test_explicit_revision_supersedes():
+    evidence = EvidenceSystem()
+    evidence.add_evidence("statement", {"who": "Eva", "says": "I was asleep."})
+    result = evidence.add_evidence("statement", {"who": "Eva", "says": "I lied earlier.", "revises": True})
+    assert result == "Statement from Eva changed (version 2)"
+
+
+def test_question_context_includes_established_facts(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+
+    async def run():
+        game = GameMaster()
+
+        async def generate_response(prompt, action="default", validate=None):
+            return OPENING
+
+        game.model.generate_response = generate_response
+        await game.start_game()
+        context = game._build_question_context("Was Eva in the library?")
+        await game.model.close()
+        return context
+
+    context = asyncio.run(run())
+    assert "- Eva says: I never left the library that night." in context
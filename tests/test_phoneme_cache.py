@@ -0,0 +1,69 @@
+from src.models.phoneme_cache import PhonemeCache
+
+# Toy G2P: "the" before a vowel and the noun "wind" in front of "blew"
+# change pronunciation with context, like espeak's output does
+def fake_phonemize(text, lang):
+    words = text.split()
+    pieces = []
+    for i, word in enumerate(words):
+        following = words[i + 1] if i + 1 < len(words) else ""
+        if word == "the":
+            pieces.append("ði" if following[:1] in "aeiou" else "ðə")
+        elif word == "wind" and following == "blew":
+            pieces.append("wɪnd")
+        elif word == "wind":
+            pieces.append("waɪnd")
+        else:
+            pieces.append(f"<{word}>")
+    return " ".join(pieces)
+
+
+def make_cache(**kwargs):
+    calls = []
+
+    def phonemize(text, lang):
+        calls.append(text)
+        return fake_phonemize(text, lang)
+
+    return PhonemeCache(phonemize, **kwargs), calls
+
+
+def test_known_words_are_composed():
+    cache, calls = make_cache()
+    cache.phonemize("Eva opened the door", "a")
+    cache.phonemize("Rosa closed the gate", "a")
+    assert cache.phonemize("Eva closed the door", "a") == "<Eva> <closed> ðə <door>"
+    assert len(calls) == 2
+
+
+def test_context_dependent_word_is_not_composed():
+    cache, calls = make_cache()
+    cache.phonemize("Eva opened the door", "a")
+    cache.phonemize("Eva opened the attic", "a")
+    cache.phonemize("Rosa closed the gate", "a")
+    # "the" was learned two ways, so this sentence must go through G2P
+    assert cache.phonemize("Rosa opened the attic door", "a") == fake_phonemize("Rosa opened the attic door", "a")
+    assert calls[-1] == "Rosa opened the attic door"
+    assert ("a", "the") in cache.ambiguous
+    assert cache.stats()["ambiguous_words"] == 1
+
+
+def test_listed_homographs_are_never_composed():
+    cache, calls = make_cache()
+    cache.phonemize("the wind blew", "a")
+    cache.phonemize("Eva will wind it", "a")
+    assert cache.phonemize("Eva will wind the clock", "a") == fake_phonemize("Eva will wind the clock", "a")
+    assert len(calls) == 3
+
+
+def test_ambiguous_words_survive_reload(tmp_path):
+    path = tmp_path / "phonemes.json"
+    cache, _ = make_cache(persist_path=path)
+    cache.phonemize("Eva opened the door", "a")
+    cache.phonemize("Eva opened the attic", "a")
+    cache.save()
+
+    reloaded, calls = make_cache(persist_path=path)
+    assert ("a", "the") in reloaded.ambiguous
+    reloaded.phonemize("Eva opened the attic door", "a")
+    assert calls == ["Eva opened the attic door"]
@@ -0,0 +1,67 @@
+from src.game.truth_battle import TruthBattleSystem
+from src.utils.truth_dedup import fact_guard, leading_words
+
+
+def test_reversed_roles_are_separate_truths():
+    battle = TruthBattleSystem()
+    battle.declare_red_truth("Kinzo killed Eva.")
+    assert battle.declare_red_truth("Eva killed Kinzo.") == "「Eva killed Kinzo.」"
+    assert len(battle.red_truths) == 2
+    assert battle.red_truths[0]["aliases"] == []
+
+
+def test_reversed_roles_mid_sentence():
+    battle = TruthBattleSystem()
+    battle.declare_red_truth("In the study, Kinzo killed Eva.")
+    battle.declare_red_truth("In the study, Eva killed Kinzo.")
+    assert len(battle.red_truths) == 2
+
+
+def test_capitalized_sentence_start_is_not_a_name():
+    battle = TruthBattleSystem()
+    battle.declare_red_truth("The study door was locked.")
+    assert battle.declare_red_truth("Study door was locked.") == "「The study door was locked.」"
+    assert len(battle.red_truths) == 1
+    assert battle.red_truths[0]["aliases"] == ["Study door was locked."]
+
+
+def test_different_sentence_initial_names_stay_apart():
+    battle = TruthBattleSystem()
+    battle.declare_red_truth("Eva was in the study at 9 PM.")
+    battle.declare_red_truth("Rosa was in the study at 9 PM.")
+    assert len(battle.red_truths) == 2
+
+
+def test_paraphrase_still_merges():
+    battle = TruthBattleSystem()
+    battle.declare_red_truth("Nobody entered the study after 9 PM.")
+    battle.declare_red_truth("No one entered the study after 9 PM.")
+    assert len(battle.red_truths) == 1
+
+
+def test_fact_guard_keeps_name_order():
+    assert fact_guard("Later, Eva killed Kinzo.")[1] == ("eva", "kinzo")
+    assert fact_guard("Later, Kinzo killed Eva.")[1] == ("kinzo", "eva")
+    assert fact_guard("Study door was locked.")[1] == ()
+    assert leading_words("Study door was locked. Eva left.") == {"study", "eva"}
+
+
+def test_contradicting_truths_stay_apart():
+    pairs = [
+        ("Nobody entered the study before 9 PM.", "Nobody entered the study after 9 PM."),
+        ("The master key was in the study when Kinzo died.",
+         "The master key was in the library when Kinzo died."),
+        ("Kinzo was alive at 10 PM.", "Kinzo was dead at 10 PM."),
+        ("Eva was inside the study at 9 PM.", "Eva was outside the study at 9 PM."),
+    ]
+    for first, second in pairs:
+        battle = TruthBattleSystem()
+        battle.declare_red_truth(first)
+        assert battle.declare_red_truth(second) == f"「{second}」"
+        assert len(battle.red_truths) == 2
+        assert second in battle.format_red_truths()
+
+
+def test_fact_guard_keeps_qualifiers_and_locations():
+    assert fact_guard("Eva was inside the study.")[3] == {"inside"}
+    assert fact_guard("Eva was in the guest room.", frozenset({"guest", "room"}))[3] == {"guest", "room"}